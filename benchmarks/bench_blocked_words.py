@@ -0,0 +1,56 @@
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.matcher import AhoCorasick
+
+MESSAGES = [
+    "chào mọi người, hôm nay server có event gì không?",
+    "ai rảnh vào voice chơi valorant không",
+    "check cái clip này đi https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "mình mới lên rank kim cương rồi 🎉🎉",
+    "admin ơi cho em hỏi cách lấy role với ạ",
+    "lol",
+    "gg wp",
+    "hôm qua mất điện cả tối, chán thật sự luôn á mọi người ơi",
+] * 125
+
+def random_words(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) for _ in range(count)]
+
+def naive_first_match(words: list, content_lower: str):
+    for index, word in enumerate(words):
+        if word.lower() in content_lower:
+            return index
+    return None
+
+def bench(label: str, func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in MESSAGES:
+            func(message.lower())
+        best = min(best, time.perf_counter() - start)
+    per_message = best / len(MESSAGES) * 1e6
+    print(f"  {label:<14} {per_message:10.2f} µs/tin nhắn")
+    return per_message
+
+def main():
+    for count in (10, 1000, 50000):
+        words = random_words(count)
+        start = time.perf_counter()
+        matcher = AhoCorasick(words)
+        build_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"{count} từ cấm (build Aho-Corasick: {build_ms:.1f} ms)")
+        naive = bench("vòng lặp cũ", lambda text: naive_first_match(words, text))
+        compiled = bench("Aho-Corasick", matcher.first_match)
+        print(f"  nhanh hơn     {naive / compiled:10.1f}x")
+
+if __name__ == "__main__":
+    main()
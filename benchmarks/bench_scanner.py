@@ -0,0 +1,91 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.scanner import URL_PATTERN, DISCORD_TOKEN_PATTERN, SUSPICIOUS_PATTERNS, scan_message
+
+CHAT = [
+    "chào mọi người, hôm nay server có event gì không?",
+    "ai rảnh vào voice chơi valorant không",
+    "mình mới lên rank kim cương rồi 🎉🎉",
+    "admin ơi cho em hỏi cách lấy role với ạ",
+    "lol",
+    "gg wp",
+    "hôm qua mất điện cả tối, chán thật sự luôn á mọi người ơi",
+    "ok <:pepe_laugh:123456789012345678>",
+    "tối nay 9h đánh rank nha anh em",
+    "free nitro ai cần không haha đùa thôi",
+]
+
+LINKS = [
+    "check cái clip này đi https://youtube.com/watch?v=dQw4w9WgXcQ",
+    "tải mod ở đây nè github.com/user/repo/releases",
+    "xem thử www.example.org/news/123 đi",
+]
+
+SCAMS = [
+    "FREE NITRO cho 100 người đầu tiên https://discord-gift.site/claim",
+    "steam giveaway 50$ vào đây steamcommunity.ru/gift",
+    "token nè MTIzNDU2Nzg5MDEyMzQ1Njc4OTAxMjM0.GaBcDe.abcdefghijklmnopqrstuvwxyz1",
+]
+
+def build_corpus(size: int = 10000, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.90:
+            corpus.append(rng.choice(CHAT))
+        elif roll < 0.99:
+            corpus.append(rng.choice(LINKS))
+        else:
+            corpus.append(rng.choice(SCAMS))
+    return corpus
+
+def legacy_scan(content: str):
+    has_token = bool(DISCORD_TOKEN_PATTERN.search(content))
+    urls = URL_PATTERN.findall(content)
+    suspicious = False
+    for pattern in SUSPICIOUS_PATTERNS:
+        if pattern.search(content):
+            suspicious = True
+            break
+    URL_PATTERN.findall(content)
+    return urls, has_token, suspicious and bool(urls)
+
+def single_pass(content: str):
+    result = scan_message(content)
+    return result.urls, result.has_token, result.suspicious
+
+def bench(label: str, func, corpus: list, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    per_message = best / len(corpus) * 1e6
+    print(f"  {label:<14} {per_message:10.2f} µs/tin nhắn")
+    return per_message
+
+def main():
+    corpus = build_corpus()
+    for message in set(corpus):
+        assert legacy_scan(message) == single_pass(message), message
+    
+    print(f"{len(corpus)} tin nhắn (90% chat, 9% link, 1% scam)")
+    legacy = bench("regex tuần tự", legacy_scan, corpus)
+    scanned = bench("quét một lần", single_pass, corpus)
+    print(f"  nhanh hơn     {legacy / scanned:10.1f}x")
+    
+    for label, messages in (("chỉ chat", CHAT), ("chỉ link", LINKS + SCAMS)):
+        print(label)
+        legacy = bench("regex tuần tự", legacy_scan, messages * 500)
+        scanned = bench("quét một lần", single_pass, messages * 500)
+        print(f"  nhanh hơn     {legacy / scanned:10.1f}x")
+
+if __name__ == "__main__":
+    main()
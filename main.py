@@ -5,6 +5,13 @@ import asyncio
 import os
 from dotenv import load_dotenv
 
+from src.utils import JSONStorage
+from src.storage import configure_store, get_store
+from src.scheduler import configure_scheduler, stop_scheduler
+from src.context import MessageContext
+from src.executor import get_executor
+from src.modlog import configure_modlog, get_modlog
+
 load_dotenv()
 
 intents = discord.Intents.default()
@@ -22,10 +29,35 @@ class VRBot(commands.Bot):
         self._synced = False
     
     async def setup_hook(self):
+        JSONStorage.configure(
+            write_behind=os.getenv("STORAGE_WRITE_BEHIND", "0") == "1",
+            flush_interval=float(os.getenv("STORAGE_FLUSH_INTERVAL", "2"))
+        )
+        await configure_store(os.getenv("STORAGE_BACKEND", "json"))
+        scheduler = await configure_scheduler(self)
+        configure_modlog(self)
+        
         await self.load_extension("src.moderation")
         await self.load_extension("src.automod")
         await self.load_extension("src.antispam")
         await self.load_extension("src.antilink")
+        
+        pending = await scheduler.load()
+        if pending:
+            print(f"Đã nạp {pending} lệnh ban/mute có thời hạn")
+        scheduler.start()
+    
+    async def close(self):
+        try:
+            await stop_scheduler()
+            await get_modlog().close()
+            await get_executor().close()
+            try:
+                await get_store().close()
+            finally:
+                await JSONStorage.flush()
+        finally:
+            await super().close()
     
     async def on_ready(self):
         print(f"Bot đã sẵn sàng: {self.user.name} (ID: {self.user.id})")
@@ -50,25 +82,27 @@ class VRBot(commands.Bot):
         if not message.guild:
             return
         
+        ctx = await MessageContext.build(message)
+        
         automod = self.get_cog("AutoModCog")
         if automod:
-            blocked = await automod.check_blocked_words(message)
+            blocked = await automod.check_blocked_words(message, ctx)
             if blocked:
                 return
         
         antilink = self.get_cog("AntiLinkCog")
         if antilink:
-            scam_detected = await antilink.check_scam_links(message)
+            scam_detected = await antilink.check_scam_links(message, ctx)
             if scam_detected:
                 return
             
-            link_blocked = await antilink.check_blocked_links(message)
+            link_blocked = await antilink.check_blocked_links(message, ctx)
             if link_blocked:
                 return
         
         antispam = self.get_cog("AntiSpamCog")
         if antispam:
-            spam_detected = await antispam.check_spam(message)
+            spam_detected = await antispam.check_spam(message, ctx)
             if spam_detected:
                 return
         
@@ -118,6 +152,18 @@ async def vrhelp(interaction: discord.Interaction):
         inline=False
     )
     
+    embed.add_field(
+        name="🚫 DANH SÁCH CHẶN RIÊNG",
+        value=(
+            "`/vrblock word:... [action] [duration]` - Thêm từ cấm\n"
+            "`/vrblock link:...` - Thêm link cấm\n"
+            "`/vrblock domain:...` - Thêm domain scam\n"
+            "`/vrunblock ...` - Xóa khỏi danh sách chặn\n"
+            "`/vrspam [setting] [value]` - Chỉnh ngưỡng chống spam"
+        ),
+        inline=False
+    )
+    
     embed.add_field(
         name="📊 THÔNG TIN",
         value=(
@@ -153,8 +199,6 @@ async def vrhelp(interaction: discord.Interaction):
 
 @bot.tree.command(name="vrstatus", description="Kiểm tra trạng thái bot")
 async def vrstatus(interaction: discord.Interaction):
-    from src.utils import JSONStorage
-    
     config = await JSONStorage.load("config.json")
     guild_config = config.get("guilds", {}).get(str(interaction.guild.id), {})
     
@@ -194,9 +238,7 @@ async def vrstatus(interaction: discord.Interaction):
         inline=False
     )
     
-    warn_data = await JSONStorage.load("warn.json")
-    guild_warns = warn_data.get("warnings", {}).get(str(interaction.guild.id), {})
-    total_warns = sum(len(warns) for warns in guild_warns.values())
+    total_warns = await get_store().count_guild_warnings(interaction.guild.id)
     
     embed.add_field(
         name="⚠️ Tổng Cảnh Cáo",
@@ -204,6 +246,30 @@ async def vrstatus(interaction: discord.Interaction):
         inline=True
     )
     
+    cache_stats = JSONStorage.cache_stats()
+    embed.add_field(
+        name="💾 Cache",
+        value=f"Hit: {cache_stats['hits']} | Miss: {cache_stats['misses']}",
+        inline=True
+    )
+    
+    antispam = bot.get_cog("AntiSpamCog")
+    if antispam:
+        tracker_stats = antispam.tracker.stats()
+        embed.add_field(
+            name="🧠 Anti-Spam",
+            value=f"Đang theo dõi: {tracker_stats['users']} người | ~{tracker_stats['bytes'] // 1024} KB",
+            inline=True
+        )
+    
+    executor_stats = get_executor().stats()
+    modlog_stats = get_modlog().stats()
+    embed.add_field(
+        name="🚦 Hàng đợi API",
+        value=f"Chờ: {executor_stats['queued']} | Xong: {executor_stats.get('completed', 0)} | 429: {executor_stats.get('rate_limited', 0)} | Lỗi: {executor_stats.get('failed', 0)} | Log gộp: {modlog_stats['queued']}→{modlog_stats['messages']}",
+        inline=True
+    )
+    
     await interaction.response.send_message(embed=embed)
 
 def main():
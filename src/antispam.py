@@ -1,63 +1,124 @@
 import discord
-from discord.ext import commands
-from datetime import datetime, timedelta
-from typing import Dict, List
-from collections import defaultdict
+from discord.ext import commands, tasks
+from datetime import timedelta
+from typing import Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict, deque
 import asyncio
-import re
+import sys
+import time
 
-from src.utils import JSONStorage, EmbedBuilder
+from src.utils import JSONStorage, EmbedBuilder, delete_messages_safely
+from src.context import MessageContext
+from src.matcher import simhash, hamming_distance, duplicate_distance, split_url
+from src.ratelimit import RateLimiter
+from src.profiles import SpamSettings, SpamProfiles
+from src.executor import get_executor
+from src.modlog import get_modlog
+from src.dedup import get_punishments
+
+MAX_TRACKED_USERS_PER_GUILD = 10000
+
+RAID_IGNORED_HOSTS = frozenset({
+    "youtube.com", "youtu.be", "tenor.com", "giphy.com", "imgur.com",
+    "discord.com", "discordapp.com", "discordapp.net", "twitter.com", "x.com",
+    "reddit.com", "twitch.tv", "spotify.com", "github.com", "google.com",
+    "wikipedia.org", "facebook.com", "instagram.com", "tiktok.com",
+})
+
+class UserActivity:
+    __slots__ = ("fingerprints", "channels", "emoji_count", "mention_count", "last_seen")
+    
+    def __init__(self, content_capacity: int, channel_capacity: int):
+        self.fingerprints: Deque[Optional[int]] = deque(maxlen=content_capacity)
+        self.channels: Deque[Tuple[float, int]] = deque(maxlen=channel_capacity)
+        self.emoji_count = 0
+        self.mention_count = 0
+        self.last_seen = 0.0
+    
+    def approximate_size(self) -> int:
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.fingerprints) + 36 * len(self.fingerprints)
+            + sys.getsizeof(self.channels) + 120 * len(self.channels)
+        )
 
 class SpamTracker:
     def __init__(self):
-        self.message_cache: Dict[int, Dict[int, List[datetime]]] = defaultdict(lambda: defaultdict(list))
-        self.content_cache: Dict[int, Dict[int, List[str]]] = defaultdict(lambda: defaultdict(list))
-        self.channel_cache: Dict[int, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
-        self.emoji_cache: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
-        self.mention_cache: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
-        self.slowmode_users: Dict[int, Dict[int, datetime]] = defaultdict(dict)
-        
-        self.SPAM_THRESHOLD = 5
-        self.SPAM_INTERVAL = 5
-        self.EMOJI_THRESHOLD = 10
-        self.MENTION_THRESHOLD = 5
-        self.CHANNEL_HOP_THRESHOLD = 5
-        self.CHANNEL_HOP_INTERVAL = 10
-        self.DUPLICATE_THRESHOLD = 3
-        self.MAX_MESSAGE_LENGTH = 2000
-        self.RATE_LIMIT_MESSAGES = 10
-        self.RATE_LIMIT_INTERVAL = 5
-    
-    def cleanup_old_entries(self, guild_id: int, user_id: int):
-        now = datetime.utcnow()
-        cutoff = now - timedelta(seconds=30)
-        
-        self.message_cache[guild_id][user_id] = [
-            ts for ts in self.message_cache[guild_id][user_id] if ts > cutoff
-        ]
-        
-        if len(self.content_cache[guild_id][user_id]) > 10:
-            self.content_cache[guild_id][user_id] = self.content_cache[guild_id][user_id][-10:]
-        
-        if len(self.channel_cache[guild_id][user_id]) > 10:
-            self.channel_cache[guild_id][user_id] = self.channel_cache[guild_id][user_id][-10:]
-    
-    def track_message(self, message: discord.Message) -> dict:
+        self.activity: Dict[int, "OrderedDict[int, UserActivity]"] = defaultdict(OrderedDict)
+        self.limiter = RateLimiter()
+        
+        self.MAX_TRACKED_USERS = MAX_TRACKED_USERS_PER_GUILD
+    
+    def get_activity(self, guild_id: int, user_id: int, settings: SpamSettings) -> UserActivity:
+        users = self.activity[guild_id]
+        activity = users.get(user_id)
+        if activity is None:
+            activity = UserActivity(
+                settings.duplicate_threshold,
+                settings.channel_hop_threshold
+            )
+            users[user_id] = activity
+            while len(users) > self.MAX_TRACKED_USERS:
+                users.popitem(last=False)
+        else:
+            users.move_to_end(user_id)
+            if activity.fingerprints.maxlen != settings.duplicate_threshold:
+                activity.fingerprints = deque(activity.fingerprints, maxlen=settings.duplicate_threshold)
+            if activity.channels.maxlen != settings.channel_hop_threshold:
+                activity.channels = deque(activity.channels, maxlen=settings.channel_hop_threshold)
+        return activity
+    
+    def sweep(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.monotonic()
+        removed = 0
+        
+        for guild_id in list(self.activity):
+            cutoff = now - SpamProfiles.cached(guild_id).idle_timeout
+            users = self.activity[guild_id]
+            while users:
+                user_id, activity = next(iter(users.items()))
+                if activity.last_seen >= cutoff:
+                    break
+                del users[user_id]
+                removed += 1
+            if not users:
+                del self.activity[guild_id]
+        
+        self.limiter.sweep(SpamProfiles.max_idle_timeout(), now)
+        return removed
+    
+    def stats(self) -> Dict[str, int]:
+        users = sum(len(guild_users) for guild_users in self.activity.values())
+        size = sum(
+            activity.approximate_size()
+            for guild_users in self.activity.values()
+            for activity in guild_users.values()
+        )
+        size += self.limiter.approximate_size()
+        return {"guilds": len(self.activity), "users": users, "buckets": len(self.limiter), "bytes": size}
+    
+    def consume(self, key: tuple, messages: int, interval: float, now: float) -> bool:
+        if messages <= 0:
+            return True
+        return self.limiter.consume(key, 1 / interval, messages - 1, now)
+    
+    def track_message(self, message: discord.Message, ctx: MessageContext, settings: SpamSettings) -> dict:
         guild_id = message.guild.id
         user_id = message.author.id
-        now = datetime.utcnow()
+        now = time.monotonic()
         
-        self.cleanup_old_entries(guild_id, user_id)
+        activity = self.get_activity(guild_id, user_id, settings)
+        activity.last_seen = now
         
-        self.message_cache[guild_id][user_id].append(now)
-        self.content_cache[guild_id][user_id].append(message.content)
-        self.channel_cache[guild_id][user_id].append(message.channel.id)
+        activity.fingerprints.append(simhash(message.content) if message.content else None)
+        activity.channels.append((now, message.channel.id))
         
-        emoji_count = len(re.findall(r'<a?:\w+:\d+>|[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]', message.content))
-        self.emoji_cache[guild_id][user_id] = emoji_count
+        emoji_count = ctx.emoji_count
+        activity.emoji_count = emoji_count
         
-        mention_count = len(message.mentions) + len(message.role_mentions)
-        self.mention_cache[guild_id][user_id] = mention_count
+        mention_count = ctx.mention_count
+        activity.mention_count = mention_count
         
         results = {
             "message_spam": False,
@@ -70,126 +131,303 @@ class SpamTracker:
             "details": []
         }
         
-        recent_messages = [
-            ts for ts in self.message_cache[guild_id][user_id]
-            if (now - ts).total_seconds() <= self.SPAM_INTERVAL
-        ]
-        
-        if len(recent_messages) >= self.SPAM_THRESHOLD:
+        if not self.consume(("spam", guild_id, user_id), settings.spam_threshold, settings.spam_interval, now):
             results["message_spam"] = True
-            results["details"].append(f"{len(recent_messages)} tin nhắn trong {self.SPAM_INTERVAL}s")
+            results["details"].append(f"{settings.spam_threshold}+ tin nhắn trong {settings.spam_interval}s")
+        
+        if not self.consume(("rate", guild_id, user_id), settings.rate_limit_messages, settings.rate_limit_interval, now):
+            results["rate_limit"] = True
+            results["details"].append(f"Vượt giới hạn: {settings.rate_limit_messages}+ tin nhắn trong {settings.rate_limit_interval}s")
         
-        if len(recent_messages) >= self.RATE_LIMIT_MESSAGES:
+        channel_key = ("channel", guild_id, message.channel.id)
+        if not self.consume(channel_key, settings.channel_rate_limit_messages, settings.channel_rate_limit_interval, now):
             results["rate_limit"] = True
-            results["details"].append(f"Vượt giới hạn: {len(recent_messages)} tin nhắn trong {self.RATE_LIMIT_INTERVAL}s")
+            results["details"].append(f"Kênh vượt giới hạn: {settings.channel_rate_limit_messages}+ tin nhắn trong {settings.channel_rate_limit_interval}s")
         
-        if emoji_count >= self.EMOJI_THRESHOLD:
+        if not self.consume(("guild", guild_id), settings.guild_rate_limit_messages, settings.guild_rate_limit_interval, now):
+            results["rate_limit"] = True
+            results["details"].append(f"Server vượt giới hạn: {settings.guild_rate_limit_messages}+ tin nhắn trong {settings.guild_rate_limit_interval}s")
+        
+        if emoji_count >= settings.emoji_threshold:
             results["emoji_spam"] = True
             results["details"].append(f"{emoji_count} emoji trong tin nhắn")
         
-        if mention_count >= self.MENTION_THRESHOLD:
+        if mention_count >= settings.mention_threshold:
             results["mention_spam"] = True
             results["details"].append(f"{mention_count} mentions trong tin nhắn")
         
-        recent_channels = self.channel_cache[guild_id][user_id][-self.CHANNEL_HOP_THRESHOLD:]
-        if len(set(recent_channels)) >= self.CHANNEL_HOP_THRESHOLD:
+        hop_cutoff = now - settings.channel_hop_interval
+        recent_channels = {channel_id for seen, channel_id in activity.channels if seen >= hop_cutoff}
+        if len(recent_channels) >= settings.channel_hop_threshold:
             results["channel_hop"] = True
-            results["details"].append(f"Nhảy {len(set(recent_channels))} kênh liên tục")
+            results["details"].append(f"Nhảy {len(recent_channels)} kênh trong {settings.channel_hop_interval}s")
         
-        recent_content = self.content_cache[guild_id][user_id][-self.DUPLICATE_THRESHOLD:]
-        if len(recent_content) >= self.DUPLICATE_THRESHOLD:
-            if len(set(recent_content)) == 1 and recent_content[0]:
-                results["duplicate_spam"] = True
-                results["details"].append("Gửi tin nhắn trùng lặp")
+        if self.is_near_duplicate(activity.fingerprints, settings, len(message.content)):
+            results["duplicate_spam"] = True
+            results["details"].append("Gửi tin nhắn trùng lặp")
         
-        if len(message.content) > self.MAX_MESSAGE_LENGTH:
+        if len(message.content) > settings.max_message_length:
             results["long_message"] = True
             results["details"].append(f"Tin nhắn quá dài: {len(message.content)} ký tự")
         
         return results
     
+    def is_near_duplicate(self, fingerprints: Deque[Optional[int]], settings: SpamSettings, length: int) -> bool:
+        if len(fingerprints) < settings.duplicate_threshold:
+            return False
+        
+        latest = fingerprints[-1]
+        if latest is None:
+            return False
+        
+        limit = duplicate_distance(length, settings.duplicate_distance)
+        return all(
+            fingerprint is not None and hamming_distance(fingerprint, latest) <= limit
+            for fingerprint in fingerprints
+        )
+    
     def is_rate_limited(self, guild_id: int, user_id: int) -> bool:
-        if user_id in self.slowmode_users.get(guild_id, {}):
-            expiry = self.slowmode_users[guild_id][user_id]
-            if datetime.utcnow() < expiry:
-                return True
-            else:
-                del self.slowmode_users[guild_id][user_id]
-        return False
+        return self.limiter.is_blocked(("slowmode", guild_id, user_id))
     
     def set_rate_limit(self, guild_id: int, user_id: int, duration_seconds: int = 60):
-        self.slowmode_users[guild_id][user_id] = datetime.utcnow() + timedelta(seconds=duration_seconds)
+        self.limiter.block(("slowmode", guild_id, user_id), duration_seconds)
+
+class RaidMessage(NamedTuple):
+    author_id: int
+    channel_id: int
+    message_id: int
+
+class RaidSignal:
+    __slots__ = ("label", "messages", "punished")
+    
+    def __init__(self, label: str, messages: List[RaidMessage], punished: Set[int]):
+        self.label = label
+        self.messages = messages
+        self.punished = punished
+
+class RaidDetector:
+    def __init__(self):
+        self.buckets: Dict[int, Deque[Tuple[int, Dict[str, Dict[int, RaidMessage]]]]] = {}
+        self.active: Dict[int, Dict[str, Tuple[float, Set[int]]]] = defaultdict(dict)
+        
+        self.RAID_WINDOW = 60
+        self.RAID_BUCKET_SECONDS = 10
+        self.RAID_MIN_CONTENT_LENGTH = 20
+        self.MAX_KEYS_PER_BUCKET = 5000
+        self.MAX_AUTHORS_PER_KEY = 200
+    
+    @staticmethod
+    def is_ignored_host(hostname: str) -> bool:
+        labels = hostname.lower().split(".")
+        return any(".".join(labels[i:]) in RAID_IGNORED_HOSTS for i in range(len(labels) - 1))
+    
+    @staticmethod
+    def is_fresh_member(member: discord.abc.User, settings: SpamSettings) -> bool:
+        now = discord.utils.utcnow()
+        if settings.raid_account_age_days and member.created_at > now - timedelta(days=settings.raid_account_age_days):
+            return True
+        joined_at = getattr(member, "joined_at", None)
+        if settings.raid_join_age_hours and joined_at and joined_at > now - timedelta(hours=settings.raid_join_age_hours):
+            return True
+        return False
+    
+    def fingerprints(self, ctx: MessageContext) -> List[Tuple[str, str]]:
+        keys = []
+        for url in dict.fromkeys(ctx.urls):
+            hostname, path = split_url(url)
+            if hostname and not self.is_ignored_host(hostname):
+                link = hostname + path.rstrip("/")
+                keys.append((f"link:{link}", link))
+        
+        content = " ".join(ctx.content_lower.split())
+        if len(content) >= self.RAID_MIN_CONTENT_LENGTH:
+            keys.append((f"content:{hash(content):x}", ctx.content[:200]))
+        return keys
+    
+    def _current_bucket(self, guild_id: int, now: float) -> Dict[str, Dict[int, RaidMessage]]:
+        bucket_id = int(now // self.RAID_BUCKET_SECONDS)
+        buckets = self.buckets.get(guild_id)
+        if buckets is None:
+            buckets = deque(maxlen=max(1, self.RAID_WINDOW // self.RAID_BUCKET_SECONDS))
+            self.buckets[guild_id] = buckets
+        
+        if not buckets or buckets[-1][0] != bucket_id:
+            buckets.append((bucket_id, {}))
+        return buckets[-1][1]
+    
+    def _authors(self, guild_id: int, key: str, now: float) -> Dict[int, RaidMessage]:
+        oldest = int((now - self.RAID_WINDOW) // self.RAID_BUCKET_SECONDS)
+        authors: Dict[int, RaidMessage] = {}
+        for bucket_id, entries in self.buckets.get(guild_id, ()):
+            if bucket_id > oldest and key in entries:
+                authors.update(entries[key])
+        return authors
+    
+    def record(
+        self,
+        message: discord.Message,
+        ctx: MessageContext,
+        settings: SpamSettings,
+        now: Optional[float] = None
+    ) -> Optional[RaidSignal]:
+        if now is None:
+            now = time.monotonic()
+        
+        if not self.is_fresh_member(message.author, settings):
+            return None
+        
+        keys = self.fingerprints(ctx)
+        if not keys:
+            return None
+        
+        guild_id = message.guild.id
+        author_id = message.author.id
+        ref = RaidMessage(author_id, message.channel.id, message.id)
+        bucket = self._current_bucket(guild_id, now)
+        active = self.active[guild_id]
+        
+        for key, _ in keys:
+            entries = bucket.get(key)
+            if entries is None:
+                if len(bucket) >= self.MAX_KEYS_PER_BUCKET:
+                    continue
+                entries = bucket[key] = {}
+            if len(entries) < self.MAX_AUTHORS_PER_KEY:
+                entries[author_id] = ref
+        
+        labels: List[str] = []
+        messages: Dict[int, RaidMessage] = {}
+        punished: Set[int] = set()
+        for key, label in keys:
+            raid = active.get(key)
+            if raid is not None and raid[0] > now:
+                handled = raid[1]
+                if author_id not in handled:
+                    handled.add(author_id)
+                    punished.add(author_id)
+                messages[author_id] = ref
+                labels.append(label)
+                continue
+            
+            authors = self._authors(guild_id, key, now)
+            if len(authors) >= settings.raid_author_threshold:
+                active[key] = (now + self.RAID_WINDOW, set(authors))
+                messages.update(authors)
+                punished.update(authors)
+                labels.append(label)
+        
+        if not messages:
+            return None
+        return RaidSignal(" | ".join(dict.fromkeys(labels)), list(messages.values()), punished)
+    
+    def sweep(self, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.monotonic()
+        oldest = int((now - self.RAID_WINDOW) // self.RAID_BUCKET_SECONDS)
+        
+        for guild_id in list(self.buckets):
+            buckets = self.buckets[guild_id]
+            while buckets and buckets[0][0] <= oldest:
+                buckets.popleft()
+            if not buckets:
+                del self.buckets[guild_id]
+        
+        for guild_id in list(self.active):
+            active = self.active[guild_id]
+            for key in [key for key, (expiry, _) in active.items() if expiry <= now]:
+                del active[key]
+            if not active:
+                del self.active[guild_id]
+    
+    def stats(self) -> Dict[str, int]:
+        keys = sum(len(entries) for buckets in self.buckets.values() for _, entries in buckets)
+        return {"guilds": len(self.buckets), "keys": keys, "active": sum(len(active) for active in self.active.values())}
 
 class AntiSpamCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.tracker = SpamTracker()
+        self.raids = RaidDetector()
+    
+    async def cog_load(self):
+        self.sweep_tracker.start()
+    
+    async def cog_unload(self):
+        self.sweep_tracker.cancel()
+    
+    @tasks.loop(seconds=60)
+    async def sweep_tracker(self):
+        self.tracker.sweep()
+        self.raids.sweep()
+        get_punishments().sweep()
     
     async def get_guild_config(self, guild_id: int) -> dict:
         config = await JSONStorage.load("config.json")
         return config.get("guilds", {}).get(str(guild_id), {})
     
-    async def is_bypassed(self, member: discord.Member, channel: discord.TextChannel) -> bool:
-        config = await self.get_guild_config(member.guild.id)
-        
-        if member.guild_permissions.administrator:
-            return True
-        
-        bypass_users = config.get("bypass_users", [])
-        if member.id in bypass_users:
-            return True
-        
-        bypass_channels = config.get("bypass_channels", [])
-        if channel.id in bypass_channels:
-            return True
-        
-        bypass_roles = config.get("bypass_roles", [])
-        for role in member.roles:
-            if role.id in bypass_roles:
-                return True
-        
-        return False
-    
     async def send_log(self, guild: discord.Guild, embed: discord.Embed) -> None:
         config = await self.get_guild_config(guild.id)
-        log_channel_id = config.get("log_channel")
-        
-        if log_channel_id:
-            channel = guild.get_channel(int(log_channel_id))
-            if channel:
-                try:
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
-    
-    async def send_dm_warning(self, user: discord.Member, reason: str):
-        try:
-            embed = discord.Embed(
-                title="⚠️ Cảnh báo từ Server",
-                description=f"Bạn đã bị phát hiện spam trong **{user.guild.name}**",
-                color=discord.Color.orange()
+        get_modlog().enqueue(guild, config, embed)
+    
+    def send_dm_warning(self, user: discord.Member, reason: str) -> None:
+        embed = discord.Embed(
+            title="⚠️ Cảnh báo từ Server",
+            description=f"Bạn đã bị phát hiện spam trong **{user.guild.name}**",
+            color=discord.Color.orange()
+        )
+        embed.add_field(name="Lý do", value=reason, inline=False)
+        embed.add_field(name="Lưu ý", value="Tiếp tục spam có thể dẫn đến mute hoặc ban.", inline=False)
+        get_executor().send_dm(user, embed=embed)
+    
+    async def handle_raid(self, guild: discord.Guild, raid: RaidSignal) -> None:
+        members = [member for member in map(guild.get_member, raid.punished) if member is not None]
+        
+        messages = []
+        for raid_message in raid.messages:
+            channel = guild.get_channel_or_thread(raid_message.channel_id)
+            if channel is not None:
+                messages.append(channel.get_partial_message(raid_message.message_id))
+        
+        tasks_to_run = [delete_messages_safely(messages)]
+        
+        automod = self.bot.get_cog("AutoModCog")
+        if automod:
+            tasks_to_run.extend(
+                automod.auto_mute_user(member, "1h", f"Tham gia raid: {raid.label}")
+                for member in members
+            )
+        
+        await asyncio.gather(*tasks_to_run, return_exceptions=True)
+        
+        if len(raid.messages) > 1:
+            embed = EmbedBuilder.raid_detection(
+                users=members,
+                fingerprint=raid.label,
+                action="Xóa tin nhắn + Mute 1 giờ" if automod else "Xóa tin nhắn (AutoMod không khả dụng)"
             )
-            embed.add_field(name="Lý do", value=reason, inline=False)
-            embed.add_field(name="Lưu ý", value="Tiếp tục spam có thể dẫn đến mute hoặc ban.", inline=False)
-            await user.send(embed=embed)
-        except discord.Forbidden:
-            pass
+            await self.send_log(guild, embed)
     
-    async def check_spam(self, message: discord.Message) -> bool:
+    async def check_spam(self, message: discord.Message, ctx: Optional[MessageContext] = None) -> bool:
         if not message.guild or not message.author or message.author.bot:
             return False
         
-        if await self.is_bypassed(message.author, message.channel):
+        if ctx is None:
+            ctx = await MessageContext.build(message)
+        
+        if ctx.bypassed:
             return False
         
         if self.tracker.is_rate_limited(message.guild.id, message.author.id):
-            try:
-                await message.delete()
-            except (discord.Forbidden, discord.NotFound):
-                pass
+            get_executor().delete_message(message)
+            return True
+        
+        settings = await SpamProfiles.get(message.guild.id)
+        raid = self.raids.record(message, ctx, settings)
+        if raid is not None:
+            get_executor().spawn(self.handle_raid(message.guild, raid), "handle_raid")
             return True
         
-        results = self.tracker.track_message(message)
+        results = self.tracker.track_message(message, ctx, settings)
         
         has_spam = any([
             results["message_spam"],
@@ -203,10 +441,11 @@ class AntiSpamCog(commands.Cog):
         if not has_spam and not results["rate_limit"]:
             return False
         
-        try:
-            await message.delete()
-        except (discord.Forbidden, discord.NotFound):
-            pass
+        get_executor().delete_message(message)
+        if not results["rate_limit"]:
+            action = "mute" if results["mention_spam"] or results["message_spam"] else "warn"
+            if get_punishments().is_active(message.guild.id, message.author.id, action):
+                return True
         
         spam_types = []
         if results["message_spam"]:
@@ -227,7 +466,7 @@ class AntiSpamCog(commands.Cog):
         
         if results["rate_limit"]:
             self.tracker.set_rate_limit(message.guild.id, message.author.id, 60)
-            await self.send_dm_warning(message.author, f"Bạn đang gửi tin nhắn quá nhanh. Vui lòng đợi 1 phút.")
+            self.send_dm_warning(message.author, f"Bạn đang gửi tin nhắn quá nhanh. Vui lòng đợi 1 phút.")
             
             embed = EmbedBuilder.spam_detection(
                 user=message.author,
@@ -239,11 +478,11 @@ class AntiSpamCog(commands.Cog):
         elif results["mention_spam"] or results["message_spam"]:
             automod = self.bot.get_cog("AutoModCog")
             if automod:
-                await automod.auto_mute_user(message.author, "5m", f"Auto spam detection: {spam_type_str}")
+                get_executor().spawn(automod.auto_mute_user(message.author, "5m", f"Auto spam detection: {spam_type_str}"), "auto_mute_user")
         else:
             automod = self.bot.get_cog("AutoModCog")
             if automod:
-                await automod.add_warning(message.author, "🤖 CẢNH SÁT VIỆT REALM", f"{spam_type_str}", auto=True)
+                get_executor().spawn(automod.add_warning(message.author, "🤖 CẢNH SÁT VIỆT REALM", f"{spam_type_str}", auto=True), "add_warning")
         
         return True
 
@@ -0,0 +1,64 @@
+import discord
+from typing import Dict, Any
+
+from src.utils import JSONStorage
+
+MAX_CACHED_MEMBERS = 50000
+
+class BypassPolicy:
+    _policies: Dict[int, "BypassPolicy"] = {}
+    
+    def __init__(self, guild_config: Dict[str, Any]):
+        self.users = frozenset(guild_config.get("bypass_users", []))
+        self.roles = frozenset(guild_config.get("bypass_roles", []))
+        self.channels = frozenset(guild_config.get("bypass_channels", []))
+        self._members: Dict[int, bool] = {}
+    
+    def is_member_bypassed(self, member: discord.Member) -> bool:
+        cached = self._members.get(member.id)
+        if cached is not None:
+            return cached
+        
+        result = (
+            member.guild_permissions.administrator
+            or member.id in self.users
+            or not self.roles.isdisjoint(role.id for role in member.roles)
+        )
+        
+        if len(self._members) >= MAX_CACHED_MEMBERS:
+            self._members.clear()
+        self._members[member.id] = result
+        return result
+    
+    def is_bypassed(self, member: discord.Member, channel: discord.abc.GuildChannel) -> bool:
+        return channel.id in self.channels or self.is_member_bypassed(member)
+    
+    @classmethod
+    async def get(cls, guild_id: int) -> "BypassPolicy":
+        policy = cls._policies.get(guild_id)
+        if policy is None:
+            config = await JSONStorage.load("config.json")
+            policy = cls(config.get("guilds", {}).get(str(guild_id), {}))
+            cls._policies[guild_id] = policy
+        return policy
+    
+    @classmethod
+    async def check(cls, member: discord.Member, channel: discord.abc.GuildChannel) -> bool:
+        policy = await cls.get(member.guild.id)
+        return policy.is_bypassed(member, channel)
+    
+    @classmethod
+    def invalidate(cls, guild_id: int) -> None:
+        cls._policies.pop(guild_id, None)
+    
+    @classmethod
+    def forget_member(cls, guild_id: int, member_id: int) -> None:
+        policy = cls._policies.get(guild_id)
+        if policy is not None:
+            policy._members.pop(member_id, None)
+    
+    @classmethod
+    def forget_members(cls, guild_id: int) -> None:
+        policy = cls._policies.get(guild_id)
+        if policy is not None:
+            policy._members.clear()
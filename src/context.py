@@ -0,0 +1,37 @@
+import discord
+from typing import List
+import re
+
+from src.bypass import BypassPolicy
+from src.scanner import ScanResult, scan_message
+
+EMOJI_PATTERN = re.compile(
+    r'<a?:\w+:\d+>|[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]'
+)
+
+class MessageContext:
+    __slots__ = (
+        "message", "bypassed", "content", "content_lower",
+        "scan", "urls", "mention_count", "emoji_count"
+    )
+    
+    def __init__(self, message: discord.Message, bypassed: bool):
+        self.message = message
+        self.bypassed = bypassed
+        self.content: str = message.content
+        self.content_lower: str = self.content.lower()
+        self.scan: ScanResult = scan_message(self.content)
+        self.urls: List[str] = self.scan.urls
+        self.mention_count: int = len(message.mentions) + len(message.role_mentions)
+        self.emoji_count: int = self.count_emojis(self.content)
+    
+    @staticmethod
+    def count_emojis(content: str) -> int:
+        if content.isascii() and "<" not in content:
+            return 0
+        return len(EMOJI_PATTERN.findall(content))
+    
+    @classmethod
+    async def build(cls, message: discord.Message) -> "MessageContext":
+        bypassed = await BypassPolicy.check(message.author, message.channel)
+        return cls(message, bypassed)
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+PunishmentKey = Tuple[int, int, str]
+
+RECENT_WINDOW = 10.0
+PUNISHMENT_ACTIONS = ("warn", "mute", "ban")
+
+class PunishmentRegistry:
+    def __init__(self, window: float = RECENT_WINDOW):
+        self.window = window
+        self._pending: Dict[PunishmentKey, asyncio.Future] = {}
+        self._recent: Dict[PunishmentKey, Tuple[float, Any]] = {}
+        self.metrics: Dict[str, int] = {"executed": 0, "coalesced": 0}
+    
+    def is_active(self, guild_id: int, user_id: int, action: str, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.monotonic()
+        for covering in PUNISHMENT_ACTIONS[PUNISHMENT_ACTIONS.index(action):]:
+            key = (guild_id, user_id, covering)
+            if key in self._pending:
+                return True
+            recent = self._recent.get(key)
+            if recent is not None and now - recent[0] < self.window:
+                return True
+        return False
+    
+    async def run(self, key: PunishmentKey, factory: Callable[[], Awaitable[Any]]) -> Any:
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.metrics["coalesced"] += 1
+            return await asyncio.shield(pending)
+        
+        recent = self._recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < self.window:
+            self.metrics["coalesced"] += 1
+            return recent[1]
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        self.metrics["executed"] += 1
+        try:
+            result = await factory()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if result:
+                self._recent[key] = (time.monotonic(), result)
+            return result
+        finally:
+            self._pending.pop(key, None)
+    
+    def sweep(self, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.monotonic()
+        stale = [key for key, (finished, _) in self._recent.items() if now - finished >= self.window]
+        for key in stale:
+            del self._recent[key]
+        return len(stale)
+    
+    def stats(self) -> Dict[str, int]:
+        return {**self.metrics, "pending": len(self._pending), "recent": len(self._recent)}
+
+_registry = PunishmentRegistry()
+
+def get_punishments() -> PunishmentRegistry:
+    return _registry
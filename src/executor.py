@@ -0,0 +1,218 @@
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Coroutine, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+import discord
+
+MAX_CONCURRENCY = 8
+MAX_RETRIES = 3
+BASE_BACKOFF = 0.5
+MAX_SPACING = 5.0
+
+Route = Tuple[Hashable, ...]
+ActionFactory = Callable[[], Awaitable[Any]]
+
+def _retry_after(error: Exception) -> Optional[float]:
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return float(retry_after)
+    
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("Retry-After", "X-RateLimit-Reset-After"):
+        value = headers.get(header)
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    return None
+
+def _is_global(error: Exception) -> bool:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    return headers.get("X-RateLimit-Global", "").lower() == "true"
+
+def _consume_exception(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+class RouteState:
+    __slots__ = ("queue", "worker", "pause_until", "spacing")
+    
+    def __init__(self):
+        self.queue: Deque[Tuple[ActionFactory, asyncio.Future, str]] = deque()
+        self.worker: Optional[asyncio.Task] = None
+        self.pause_until = 0.0
+        self.spacing = 0.0
+
+class ActionExecutor:
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_retries: int = MAX_RETRIES):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._routes: Dict[Route, RouteState] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._global_pause_until = 0.0
+        self._in_flight = 0
+        self.metrics: Dict[str, int] = defaultdict(int)
+        self.latency: Dict[str, Tuple[int, float]] = {}
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    def submit(self, route: Route, factory: ActionFactory, label: str = "action") -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        
+        state = self._routes.get(route)
+        if state is None:
+            state = self._routes[route] = RouteState()
+        state.queue.append((factory, future, label))
+        self.metrics["submitted"] += 1
+        
+        if state.worker is None:
+            state.worker = asyncio.create_task(self._drain(route, state))
+        return future
+    
+    def spawn(self, coro: Coroutine[Any, Any, Any], label: str = "task") -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        
+        def _done(finished: asyncio.Task) -> None:
+            self._tasks.discard(finished)
+            if not finished.cancelled() and finished.exception() is not None:
+                print(f"Lỗi khi thực thi {label}: {finished.exception()}")
+        
+        task.add_done_callback(_done)
+        return task
+    
+    async def _drain(self, route: Route, state: RouteState) -> None:
+        try:
+            while state.queue:
+                factory, future, label = state.queue.popleft()
+                if future.done():
+                    continue
+                
+                wait = max(state.pause_until, self._global_pause_until) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                
+                await self._execute(state, factory, future, label)
+                
+                state.pause_until = time.monotonic() + state.spacing
+        finally:
+            state.worker = None
+            if not state.queue:
+                self._routes.pop(route, None)
+    
+    async def _execute(self, state: RouteState, factory: ActionFactory, future: asyncio.Future, label: str) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._get_semaphore():
+                    started = time.monotonic()
+                    self._in_flight += 1
+                    try:
+                        result = await factory()
+                    finally:
+                        self._in_flight -= 1
+            except (discord.RateLimited, discord.HTTPException) as e:
+                status = getattr(e, "status", 429)
+                if status == 429:
+                    self.metrics["rate_limited"] += 1
+                    delay = _retry_after(e) or BASE_BACKOFF * (2 ** attempt)
+                    state.spacing = min(max(state.spacing * 2, delay / 4, 0.25), MAX_SPACING)
+                    if _is_global(e):
+                        self._global_pause_until = time.monotonic() + delay
+                elif status >= 500:
+                    delay = BASE_BACKOFF * (2 ** attempt) + random.uniform(0, BASE_BACKOFF)
+                else:
+                    self.metrics["failed"] += 1
+                    future.set_exception(e)
+                    return
+                
+                if attempt == self.max_retries:
+                    self.metrics["failed"] += 1
+                    future.set_exception(e)
+                    return
+                
+                self.metrics["retried"] += 1
+                await asyncio.sleep(delay)
+            except Exception as e:
+                self.metrics["failed"] += 1
+                future.set_exception(e)
+                return
+            else:
+                count, total = self.latency.get(label, (0, 0.0))
+                self.latency[label] = (count + 1, total + time.monotonic() - started)
+                state.spacing = state.spacing / 2 if state.spacing > 0.05 else 0.0
+                self.metrics["completed"] += 1
+                if not future.done():
+                    future.set_result(result)
+                return
+    
+    def delete_message(self, message: discord.Message) -> asyncio.Future:
+        return self.submit(("delete", message.channel.id), message.delete, "delete")
+    
+    def bulk_delete(self, channel: discord.TextChannel, messages: List[discord.Message]) -> asyncio.Future:
+        return self.submit(("delete", channel.id), lambda: channel.delete_messages(messages), "bulk_delete")
+    
+    def send_message(self, channel: discord.abc.Messageable, **kwargs) -> asyncio.Future:
+        return self.submit(("send", channel.id), lambda: channel.send(**kwargs), "send")
+    
+    def send_dm(self, user: discord.abc.User, **kwargs) -> asyncio.Future:
+        return self.submit(("dm", user.id), lambda: user.send(**kwargs), "dm")
+    
+    def add_roles(self, member: discord.Member, *roles: discord.abc.Snowflake, reason: Optional[str] = None) -> asyncio.Future:
+        return self.submit(("roles", member.guild.id, member.id), lambda: member.add_roles(*roles, reason=reason), "add_roles")
+    
+    def remove_roles(self, member: discord.Member, *roles: discord.abc.Snowflake, reason: Optional[str] = None) -> asyncio.Future:
+        return self.submit(("roles", member.guild.id, member.id), lambda: member.remove_roles(*roles, reason=reason), "remove_roles")
+    
+    def timeout(self, member: discord.Member, until: Optional[datetime], reason: Optional[str] = None) -> asyncio.Future:
+        return self.submit(("member", member.guild.id, member.id), lambda: member.timeout(until, reason=reason), "timeout")
+    
+    def ban(self, member: discord.Member, reason: Optional[str] = None, **kwargs) -> asyncio.Future:
+        return self.submit(("ban", member.guild.id), lambda: member.ban(reason=reason, **kwargs), "ban")
+    
+    def unban(self, guild: discord.Guild, user: discord.abc.Snowflake, reason: Optional[str] = None) -> asyncio.Future:
+        return self.submit(("ban", guild.id), lambda: guild.unban(user, reason=reason), "unban")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "queued": sum(len(state.queue) for state in self._routes.values()),
+            "routes": len(self._routes),
+            "in_flight": self._in_flight,
+            "background": len(self._tasks),
+            "latency_ms": {
+                label: round(total / count * 1000, 1)
+                for label, (count, total) in self.latency.items() if count
+            }
+        }
+    
+    async def close(self, timeout: float = 5.0) -> None:
+        workers = [state.worker for state in self._routes.values() if state.worker is not None]
+        if workers and timeout > 0:
+            await asyncio.wait(workers, timeout=timeout)
+        
+        workers = [state.worker for state in self._routes.values() if state.worker is not None]
+        pending = [*workers, *self._tasks]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        for state in self._routes.values():
+            for _, future, _ in state.queue:
+                future.cancel()
+        self._routes.clear()
+
+_executor = ActionExecutor()
+
+def get_executor() -> ActionExecutor:
+    return _executor
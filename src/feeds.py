@@ -0,0 +1,237 @@
+import asyncio
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Optional, Iterator, Tuple
+
+from src.utils import DATA_DIR
+from src.matcher import split_url
+
+FEED_DIR = "feeds"
+INDEX_DIR = ".index"
+FEED_EXTENSIONS = (".txt", ".csv", ".ndjson", ".jsonl")
+
+INDEX_MAGIC = b"VRFD"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sIqqQ")
+
+def hash_domain(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode("utf-8"), digest_size=8).digest(), "little")
+
+def normalize_domain(value: str) -> Optional[str]:
+    value = value.strip().lower()
+    if not value:
+        return None
+    if "/" in value or ":" in value:
+        hostname, _ = split_url(value)
+        value = hostname or ""
+    if value.startswith("*."):
+        value = value[2:]
+    return value if "." in value else None
+
+def iter_feed_domains(filepath: str) -> Iterator[str]:
+    extension = os.path.splitext(filepath)[1].lower()
+    
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+        if extension == ".csv":
+            reader = csv.reader(f)
+            column = 0
+            for row_number, row in enumerate(reader):
+                if not row:
+                    continue
+                if row_number == 0:
+                    header = [cell.strip().lower() for cell in row]
+                    for name in ("domain", "host", "hostname", "url"):
+                        if name in header:
+                            column = header.index(name)
+                            break
+                    else:
+                        yield row[0]
+                    continue
+                if column < len(row):
+                    yield row[column]
+        elif extension in (".ndjson", ".jsonl"):
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, str):
+                    yield entry
+                elif isinstance(entry, dict):
+                    for key in ("domain", "host", "hostname", "url"):
+                        if isinstance(entry.get(key), str):
+                            yield entry[key]
+                            break
+        else:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line:
+                    yield line.split()[-1]
+
+def build_index(feed_path: str, index_path: str) -> int:
+    stat = os.stat(feed_path)
+    hashes = sorted({
+        hash_domain(domain)
+        for domain in (normalize_domain(value) for value in iter_feed_domains(feed_path))
+        if domain
+    })
+    
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, stat.st_mtime_ns, stat.st_size, len(hashes)))
+        f.write(array("Q", hashes).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, index_path)
+    return len(hashes)
+
+def read_index_header(index_path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        with open(index_path, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != INDEX_HEADER.size:
+        return None
+    magic, version, mtime_ns, size, count = INDEX_HEADER.unpack(header)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return None
+    return mtime_ns, size, count
+
+class FeedIndex:
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._file = open(index_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, _, self.source_mtime_ns, self.source_size, self.count = INDEX_HEADER.unpack_from(self._mmap)
+        self._hashes = memoryview(self._mmap)[INDEX_HEADER.size:INDEX_HEADER.size + self.count * 8].cast("Q")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, value: int) -> bool:
+        hashes = self._hashes
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if hashes[mid] < value:
+                low = mid + 1
+            else:
+                high = mid
+        return low < self.count and hashes[low] == value
+    
+    def close(self) -> None:
+        self._hashes.release()
+        self._mmap.close()
+        self._file.close()
+
+class ScamFeeds:
+    _indexes: Dict[str, FeedIndex] = {}
+    _failed: Dict[str, Tuple[int, int]] = {}
+    _lock: Optional[asyncio.Lock] = None
+    
+    @staticmethod
+    def feed_dir() -> str:
+        return os.path.join(DATA_DIR, FEED_DIR)
+    
+    @classmethod
+    def _index_path(cls, feed_name: str) -> str:
+        return os.path.join(cls.feed_dir(), INDEX_DIR, feed_name + ".idx")
+    
+    @classmethod
+    def _scan(cls) -> Dict[str, os.stat_result]:
+        feeds = {}
+        try:
+            with os.scandir(cls.feed_dir()) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(FEED_EXTENSIONS):
+                        feeds[entry.name] = entry.stat()
+        except FileNotFoundError:
+            pass
+        return feeds
+    
+    @classmethod
+    def _prepare(cls, feeds: Dict[str, os.stat_result]) -> Dict[str, str]:
+        os.makedirs(os.path.join(cls.feed_dir(), INDEX_DIR), exist_ok=True)
+        ready = {}
+        for feed_name, stat in feeds.items():
+            index_path = cls._index_path(feed_name)
+            header = read_index_header(index_path)
+            if header is None or header[:2] != (stat.st_mtime_ns, stat.st_size):
+                try:
+                    count = build_index(os.path.join(cls.feed_dir(), feed_name), index_path)
+                except (OSError, ValueError, csv.Error) as e:
+                    print(f"Bỏ qua feed scam lỗi {feed_name}: {e}")
+                    cls._failed[feed_name] = (stat.st_mtime_ns, stat.st_size)
+                    continue
+                print(f"Đã nạp feed scam {feed_name}: {count} domain")
+            cls._failed.pop(feed_name, None)
+            ready[feed_name] = index_path
+        return ready
+    
+    @classmethod
+    async def refresh(cls) -> None:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        
+        async with cls._lock:
+            feeds = await asyncio.to_thread(cls._scan)
+            changed = {
+                name: stat for name, stat in feeds.items()
+                if cls._failed.get(name) != (stat.st_mtime_ns, stat.st_size)
+                and (
+                    name not in cls._indexes
+                    or (cls._indexes[name].source_mtime_ns, cls._indexes[name].source_size) != (stat.st_mtime_ns, stat.st_size)
+                )
+            }
+            
+            if changed:
+                ready = await asyncio.to_thread(cls._prepare, changed)
+                for feed_name, index_path in ready.items():
+                    try:
+                        new_index = await asyncio.to_thread(FeedIndex, index_path)
+                    except (OSError, ValueError) as e:
+                        print(f"Không thể mở chỉ mục feed scam {feed_name}: {e}")
+                        continue
+                    old_index = cls._indexes.get(feed_name)
+                    cls._indexes[feed_name] = new_index
+                    if old_index is not None:
+                        old_index.close()
+            
+            for feed_name in [name for name in cls._indexes if name not in feeds]:
+                cls._indexes.pop(feed_name).close()
+            for feed_name in [name for name in cls._failed if name not in feeds]:
+                del cls._failed[feed_name]
+    
+    @classmethod
+    def match(cls, url: str) -> Optional[str]:
+        if not cls._indexes:
+            return None
+        
+        hostname, _ = split_url(url)
+        if not hostname:
+            return None
+        
+        labels = hostname.split(".")
+        for i in range(len(labels) - 1):
+            domain = ".".join(labels[i:])
+            domain_hash = hash_domain(domain)
+            for index in cls._indexes.values():
+                if domain_hash in index:
+                    return domain
+        return None
+    
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {name: len(index) for name, index in cls._indexes.items()}
+    
+    @classmethod
+    def close(cls) -> None:
+        for index in cls._indexes.values():
+            index.close()
+        cls._indexes.clear()
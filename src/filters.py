@@ -0,0 +1,150 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils import JSONStorage
+from src.matcher import DomainMatcher, compile_patterns
+from src.feeds import ScamFeeds
+
+BLOCKLIST_FILE = "ban-mute-BlockWord.json"
+
+MAX_FILTER_BYTES = 64 * 1024 * 1024
+
+def _global_section(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "blocked_words": data.get("blocked_words", {}),
+        "blocked_links": data.get("blocked_links", []),
+        "scam_domains": data.get("scam_domains", [])
+    }
+
+class FilterSet:
+    def __init__(self, section: Dict[str, Any]):
+        self.words: Dict[str, dict] = dict(section.get("blocked_words", {}))
+        self.word_entries: List[Tuple[str, dict]] = list(self.words.items())
+        self.word_matcher = compile_patterns([word.lower() for word, _ in self.word_entries])
+        
+        self.blocked_links = self._dedupe(section.get("blocked_links", []))
+        self.scam_domains = self._dedupe(section.get("scam_domains", []))
+        self.link_matcher = DomainMatcher(self.blocked_links)
+        self.scam_matcher = DomainMatcher(self.scam_domains)
+        
+        self.size = (
+            self.word_matcher.size
+            + sum(len(link) + 160 for link in self.blocked_links)
+            + sum(len(domain) + 160 for domain in self.scam_domains)
+        )
+    
+    @staticmethod
+    def _dedupe(items: List[str]) -> List[str]:
+        return list(dict.fromkeys(item.lower() for item in items))
+    
+    def match_word(self, content_lower: str) -> Optional[Tuple[str, dict]]:
+        index = self.word_matcher.first_match(content_lower)
+        if index is None:
+            return None
+        return self.word_entries[index]
+
+class GuildFilters:
+    def __init__(self, shared: FilterSet, guild_section: Dict[str, Any]):
+        self.source = guild_section
+        self.shared = shared
+        self.local = FilterSet(guild_section)
+        self.size = self.local.size
+    
+    def match_word(self, content_lower: str) -> Optional[Tuple[str, dict]]:
+        match = self.shared.match_word(content_lower)
+        if match is not None:
+            word, entry = match
+            return word, self.local.words.get(word, entry)
+        return self.local.match_word(content_lower)
+    
+    def match_blocked_link(self, url: str) -> Optional[str]:
+        return self.local.link_matcher.match(url) or self.shared.link_matcher.match(url)
+    
+    def match_scam_domain(self, url: str) -> Optional[str]:
+        return self.local.scam_matcher.match(url) or self.shared.scam_matcher.match(url) or ScamFeeds.match(url)
+
+class FilterRegistry:
+    _filters: "OrderedDict[int, GuildFilters]" = OrderedDict()
+    _shared: Optional[FilterSet] = None
+    _default: Optional[GuildFilters] = None
+    _lock: Optional[asyncio.Lock] = None
+    _global_section: Dict[str, Any] = {}
+    _guild_sections: Dict[str, Any] = {}
+    _generation = -1
+    _total_bytes = 0
+    max_bytes = MAX_FILTER_BYTES
+    
+    @classmethod
+    async def _sync(cls) -> None:
+        generation = await JSONStorage.generation(BLOCKLIST_FILE)
+        if generation == cls._generation:
+            return
+        
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        
+        async with cls._lock:
+            generation = await JSONStorage.generation(BLOCKLIST_FILE)
+            if generation == cls._generation:
+                return
+            
+            data = await JSONStorage.load(BLOCKLIST_FILE)
+            global_section = _global_section(data)
+            guild_sections = data.get("guilds", {})
+            
+            if global_section != cls._global_section:
+                shared = await asyncio.to_thread(FilterSet, global_section)
+                cls._global_section = global_section
+                cls._shared = shared
+                cls._default = GuildFilters(shared, {})
+                cls.clear()
+            else:
+                for guild_id, filters in list(cls._filters.items()):
+                    if guild_sections.get(str(guild_id), {}) != filters.source:
+                        cls.invalidate(guild_id)
+            
+            cls._guild_sections = guild_sections
+            cls._generation = generation
+    
+    @classmethod
+    async def get(cls, guild_id: int) -> GuildFilters:
+        await cls._sync()
+        
+        filters = cls._filters.get(guild_id)
+        if filters is not None:
+            cls._filters.move_to_end(guild_id)
+            return filters
+        
+        guild_section = cls._guild_sections.get(str(guild_id), {})
+        if not any(guild_section.values()):
+            return cls._default
+        
+        filters = GuildFilters(cls._shared, guild_section)
+        cls._filters[guild_id] = filters
+        cls._total_bytes += filters.size
+        
+        while cls._total_bytes > cls.max_bytes and len(cls._filters) > 1:
+            _, evicted = cls._filters.popitem(last=False)
+            cls._total_bytes -= evicted.size
+        
+        return filters
+    
+    @classmethod
+    def invalidate(cls, guild_id: int) -> None:
+        filters = cls._filters.pop(guild_id, None)
+        if filters is not None:
+            cls._total_bytes -= filters.size
+    
+    @classmethod
+    def clear(cls) -> None:
+        cls._filters.clear()
+        cls._total_bytes = 0
+    
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "guilds": len(cls._filters),
+            "bytes": cls._total_bytes,
+            "shared_bytes": cls._shared.size if cls._shared is not None else 0
+        }
@@ -0,0 +1,192 @@
+import hashlib
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+class AhoCorasick:
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        
+        for index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = next_node
+            self._out[node].append(index)
+        
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child].extend(self._out[self._fail[child]])
+        
+        self._out = [sorted(set(out)) for out in self._out]
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    @property
+    def node_count(self) -> int:
+        return len(self._goto)
+    
+    @property
+    def size(self) -> int:
+        return self.node_count * 200
+    
+    def find_all(self, text: str) -> List[int]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found = set(out[0])
+        node = 0
+        
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        
+        return sorted(found)
+    
+    def first_match(self, text: str) -> Optional[int]:
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        best = out[0][0] if out[0] else None
+        node = 0
+        
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node] and (best is None or out[node][0] < best):
+                best = out[node][0]
+                if best == 0:
+                    break
+        
+        return best
+
+PLAIN_SCAN_LIMIT = 128
+
+class SubstringMatcher:
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    @property
+    def size(self) -> int:
+        return sum(len(pattern) + 60 for pattern in self.patterns)
+    
+    def find_all(self, text: str) -> List[int]:
+        return [index for index, pattern in enumerate(self.patterns) if pattern in text]
+    
+    def first_match(self, text: str) -> Optional[int]:
+        for index, pattern in enumerate(self.patterns):
+            if pattern in text:
+                return index
+        return None
+
+def compile_patterns(patterns: Sequence[str]) -> Union[AhoCorasick, SubstringMatcher]:
+    if len(patterns) <= PLAIN_SCAN_LIMIT:
+        return SubstringMatcher(patterns)
+    return AhoCorasick(patterns)
+
+def split_url(url: str) -> Tuple[Optional[str], str]:
+    if "://" not in url:
+        url = "http://" + url
+    try:
+        parts = urlsplit(url)
+        hostname = parts.hostname
+    except ValueError:
+        return None, ""
+    if not hostname:
+        return None, ""
+    return hostname.rstrip("."), parts.path.lower()
+
+class DomainMatcher:
+    def __init__(self, entries: Sequence[str]):
+        self.entries = list(entries)
+        self._rules: Dict[str, List[Tuple[str, str]]] = {}
+        
+        for entry in self.entries:
+            hostname, path = split_url(entry.strip().lower())
+            if hostname:
+                self._rules.setdefault(hostname, []).append((path.rstrip("/"), entry))
+    
+    def __len__(self) -> int:
+        return len(self._rules)
+    
+    def match(self, url: str) -> Optional[str]:
+        hostname, path = split_url(url)
+        if not hostname:
+            return None
+        
+        rules = self._rules
+        labels = hostname.split(".")
+        for i in range(len(labels)):
+            candidates = rules.get(".".join(labels[i:]))
+            if candidates:
+                for prefix, entry in candidates:
+                    if not prefix or path == prefix or path.startswith(prefix + "/"):
+                        return entry
+        return None
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+SIMHASH_MAX_LENGTH = 256
+SHORT_TEXT_LENGTH = 64
+FEATURE_CACHE_SIZE = 16384
+
+LANE_BITS = 8
+LANE_TABLES = [
+    [sum(((byte >> bit) & 1) << (LANE_BITS * (8 * position + bit)) for bit in range(8)) for byte in range(256)]
+    for position in range(SIMHASH_BITS // 8)
+]
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def feature_lanes(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode(), digest_size=SIMHASH_BITS // 8).digest()
+    lanes = 0
+    for table, byte in zip(LANE_TABLES, digest):
+        lanes |= table[byte]
+    return lanes
+
+def simhash(text: str, shingle_size: int = SHINGLE_SIZE) -> int:
+    text = " ".join(text[:SIMHASH_MAX_LENGTH].lower().split())
+    if len(text) <= shingle_size:
+        features = {text}
+    else:
+        features = {text[i:i + shingle_size] for i in range(len(text) - shingle_size + 1)}
+    
+    half = len(features) // 2
+    counts = sum(map(feature_lanes, features)).to_bytes(SIMHASH_BITS * LANE_BITS // 8, "little")
+    
+    result = 0
+    for bit, count in enumerate(counts):
+        if count > half:
+            result |= 1 << bit
+    return result
+
+def hamming_distance(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+def duplicate_distance(length: int, base: int) -> int:
+    return base + max(0, (SHORT_TEXT_LENGTH - length) // 8)
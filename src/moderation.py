@@ -2,18 +2,31 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timedelta
-from typing import Optional, Union
-import asyncio
+from typing import Optional, Union, AsyncIterator
+from contextlib import asynccontextmanager
 
 from src.utils import (
     JSONStorage, EmbedBuilder, parse_duration, 
     format_duration, get_expiry_time, delete_user_messages
 )
+from src.storage import get_store
+from src.bypass import BypassPolicy
+from src.filters import FilterRegistry, BLOCKLIST_FILE
+from src.profiles import SpamProfiles, SETTING_LABELS, compile_settings, setting_range
+from src.scheduler import get_scheduler
+from src.executor import get_executor
+from src.modlog import get_modlog, is_webhook_url
+from src.plan import ActionPlan
 
 class ModerationCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
     
+    async def cog_load(self):
+        scheduler = get_scheduler()
+        scheduler.register("ban", self.expire_ban)
+        scheduler.register("mute", self.expire_mute)
+    
     async def is_authorized(self, user_id: int) -> bool:
         data = await JSONStorage.load("authorized_users.json")
         authorized_users = data.get("authorized_users", [])
@@ -24,23 +37,25 @@ class ModerationCog(commands.Cog):
         return config.get("guilds", {}).get(str(guild_id), {})
     
     async def save_guild_config(self, guild_id: int, guild_config: dict) -> None:
-        config = await JSONStorage.load("config.json")
-        if "guilds" not in config:
-            config["guilds"] = {}
-        config["guilds"][str(guild_id)] = guild_config
-        await JSONStorage.save("config.json", config)
+        async with JSONStorage.transaction("config.json") as config:
+            config.setdefault("guilds", {})[str(guild_id)] = guild_config
+    
+    @asynccontextmanager
+    async def edit_guild_config(self, guild_id: int) -> AsyncIterator[dict]:
+        async with JSONStorage.transaction("config.json") as config:
+            guild_config = config.get("guilds", {}).get(str(guild_id))
+            if guild_config is not None:
+                yield guild_config
+                return
+            
+            guild_config = {}
+            yield guild_config
+            if guild_config:
+                config.setdefault("guilds", {})[str(guild_id)] = guild_config
     
     async def send_log(self, guild: discord.Guild, embed: discord.Embed) -> None:
         config = await self.get_guild_config(guild.id)
-        log_channel_id = config.get("log_channel")
-        
-        if log_channel_id:
-            channel = guild.get_channel(int(log_channel_id))
-            if channel:
-                try:
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+        get_modlog().enqueue(guild, config, embed)
     
     async def apply_muted_role(self, member: discord.Member) -> bool:
         config = await self.get_guild_config(member.guild.id)
@@ -50,7 +65,7 @@ class ModerationCog(commands.Cog):
             role = member.guild.get_role(int(muted_role_id))
             if role:
                 try:
-                    await member.add_roles(role, reason="Muted by CẢNH SÁT VIỆT REALM")
+                    await get_executor().add_roles(member, role, reason="Muted by CẢNH SÁT VIỆT REALM")
                     return True
                 except discord.Forbidden:
                     return False
@@ -64,54 +79,21 @@ class ModerationCog(commands.Cog):
             role = member.guild.get_role(int(muted_role_id))
             if role and role in member.roles:
                 try:
-                    await member.remove_roles(role, reason="Unmuted by CẢNH SÁT VIỆT REALM")
+                    await get_executor().remove_roles(member, role, reason="Unmuted by CẢNH SÁT VIỆT REALM")
                     return True
                 except discord.Forbidden:
                     return False
         return False
     
     async def record_ban(self, guild_id: int, user_id: int, moderator_id: int, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
-        data = await JSONStorage.load("ban-mute.json")
-        if "bans" not in data:
-            data["bans"] = {}
-        
-        if str(guild_id) not in data["bans"]:
-            data["bans"][str(guild_id)] = {}
-        
-        data["bans"][str(guild_id)][str(user_id)] = {
-            "moderator_id": moderator_id,
-            "reason": reason,
-            "duration": duration,
-            "expiry": expiry.isoformat() if expiry else None,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        await JSONStorage.save("ban-mute.json", data)
+        await get_store().record_ban(guild_id, user_id, moderator_id, reason, duration, expiry)
     
     async def record_mute(self, guild_id: int, user_id: int, moderator_id: int, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
-        data = await JSONStorage.load("ban-mute.json")
-        if "mutes" not in data:
-            data["mutes"] = {}
-        
-        if str(guild_id) not in data["mutes"]:
-            data["mutes"][str(guild_id)] = {}
-        
-        data["mutes"][str(guild_id)][str(user_id)] = {
-            "moderator_id": moderator_id,
-            "reason": reason,
-            "duration": duration,
-            "expiry": expiry.isoformat() if expiry else None,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-        await JSONStorage.save("ban-mute.json", data)
+        await get_store().record_mute(guild_id, user_id, moderator_id, reason, duration, expiry)
     
     async def remove_mute_record(self, guild_id: int, user_id: int) -> None:
-        data = await JSONStorage.load("ban-mute.json")
-        if "mutes" in data and str(guild_id) in data["mutes"]:
-            if str(user_id) in data["mutes"][str(guild_id)]:
-                del data["mutes"][str(guild_id)][str(user_id)]
-                await JSONStorage.save("ban-mute.json", data)
+        get_scheduler().cancel("mute", guild_id, user_id)
+        await get_store().remove_mute(guild_id, user_id)
     
     @app_commands.command(name="vrban", description="Cấm một người dùng khỏi server")
     @app_commands.describe(
@@ -147,53 +129,58 @@ class ModerationCog(commands.Cog):
             )
             return
         
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         expiry = get_expiry_time(duration)
         
         try:
-            await user.ban(reason=reason or "Không có lý do")
-            
-            await self.record_ban(
-                interaction.guild.id,
-                user.id,
-                interaction.user.id,
-                reason or "Không có lý do",
-                duration,
-                expiry
-            )
-            
-            asyncio.create_task(delete_user_messages(interaction.guild, user.id))
-            
-            embed = EmbedBuilder.moderation(
-                action="ban",
-                user=user,
-                moderator=interaction.user,
-                reason=reason,
-                duration=duration
-            )
-            
-            await interaction.response.send_message(
-                embed=EmbedBuilder.success(f"Đã ban {user.mention}"),
-                ephemeral=True
-            )
-            await self.send_log(interaction.guild, embed)
-            
-            if expiry:
-                await self.schedule_unban(interaction.guild, user.id, expiry)
-                
+            await get_executor().ban(user, reason=reason or "Không có lý do")
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error("Tôi không có quyền cấm người dùng này."),
                 ephemeral=True
             )
+            return
+        
+        if expiry:
+            get_scheduler().schedule("ban", interaction.guild.id, user.id, expiry)
+        else:
+            get_scheduler().cancel("ban", interaction.guild.id, user.id)
+        
+        get_executor().spawn(delete_user_messages(interaction.guild, user.id), "delete_user_messages")
+        
+        embed = EmbedBuilder.moderation(
+            action="ban",
+            user=user,
+            moderator=interaction.user,
+            reason=reason,
+            duration=duration
+        )
+        
+        plan = ActionPlan("vrban", on_error=lambda text: self.send_log(interaction.guild, EmbedBuilder.error(text)))
+        plan.add("record", lambda: self.record_ban(
+            interaction.guild.id,
+            user.id,
+            interaction.user.id,
+            reason or "Không có lý do",
+            duration,
+            expiry
+        ))
+        plan.add("reply", lambda: interaction.followup.send(
+            embed=EmbedBuilder.success(f"Đã ban {user.mention}"),
+            ephemeral=True
+        ))
+        plan.add("log", lambda: self.send_log(interaction.guild, embed))
+        await plan.run()
     
-    async def schedule_unban(self, guild: discord.Guild, user_id: int, expiry: datetime):
-        delay = (expiry - datetime.utcnow()).total_seconds()
-        if delay > 0:
-            await asyncio.sleep(delay)
+    async def expire_ban(self, guild_id: int, user_id: int):
+        guild = self.bot.get_guild(guild_id)
+        if guild:
             try:
-                await guild.unban(discord.Object(id=user_id), reason="Hết thời hạn cấm")
-            except discord.NotFound:
+                await get_executor().unban(guild, discord.Object(id=user_id), reason="Hết thời hạn cấm")
+            except (discord.NotFound, discord.Forbidden):
                 pass
+        await get_store().remove_ban(guild_id, user_id)
     
     @app_commands.command(name="vrmute", description="Tắt tiếng một người dùng")
     @app_commands.describe(
@@ -229,59 +216,62 @@ class ModerationCog(commands.Cog):
             )
             return
         
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         expiry = get_expiry_time(duration)
         
+        timeout_duration = parse_duration(duration) if duration else 2419200
+        timeout_until = discord.utils.utcnow() + timedelta(seconds=min(timeout_duration, 2419200))
+        
         try:
-            await self.apply_muted_role(user)
-            
-            timeout_duration = parse_duration(duration) if duration else 2419200
-            timeout_until = discord.utils.utcnow() + timedelta(seconds=min(timeout_duration, 2419200))
-            await user.timeout(timeout_until, reason=reason or "Không có lý do")
-            
-            await self.record_mute(
-                interaction.guild.id,
-                user.id,
-                interaction.user.id,
-                reason or "Không có lý do",
-                duration,
-                expiry
-            )
-            
-            embed = EmbedBuilder.moderation(
-                action="mute",
-                user=user,
-                moderator=interaction.user,
-                reason=reason,
-                duration=duration
-            )
-            
-            await interaction.response.send_message(
-                embed=EmbedBuilder.success(f"Đã mute {user.mention}"),
-                ephemeral=True
-            )
-            await self.send_log(interaction.guild, embed)
-            
-            if expiry:
-                await self.schedule_unmute(interaction.guild, user, expiry)
-                
+            await get_executor().timeout(user, timeout_until, reason=reason or "Không có lý do")
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error("Tôi không có quyền mute người dùng này."),
                 ephemeral=True
             )
+            return
+        
+        if expiry:
+            get_scheduler().schedule("mute", interaction.guild.id, user.id, expiry)
+        else:
+            get_scheduler().cancel("mute", interaction.guild.id, user.id)
+        
+        embed = EmbedBuilder.moderation(
+            action="mute",
+            user=user,
+            moderator=interaction.user,
+            reason=reason,
+            duration=duration
+        )
+        
+        plan = ActionPlan("vrmute", on_error=lambda text: self.send_log(interaction.guild, EmbedBuilder.error(text)))
+        plan.add("muted_role", lambda: self.apply_muted_role(user))
+        plan.add("record", lambda: self.record_mute(
+            interaction.guild.id,
+            user.id,
+            interaction.user.id,
+            reason or "Không có lý do",
+            duration,
+            expiry
+        ))
+        plan.add("reply", lambda: interaction.followup.send(
+            embed=EmbedBuilder.success(f"Đã mute {user.mention}"),
+            ephemeral=True
+        ))
+        plan.add("log", lambda: self.send_log(interaction.guild, embed))
+        await plan.run()
     
-    async def schedule_unmute(self, guild: discord.Guild, user: discord.Member, expiry: datetime):
-        delay = (expiry - datetime.utcnow()).total_seconds()
-        if delay > 0:
-            await asyncio.sleep(delay)
+    async def expire_mute(self, guild_id: int, user_id: int):
+        guild = self.bot.get_guild(guild_id)
+        member = guild.get_member(user_id) if guild else None
+        if member:
             try:
-                member = guild.get_member(user.id)
-                if member:
-                    await self.remove_muted_role(member)
-                    await member.timeout(None, reason="Hết thời hạn mute")
-                await self.remove_mute_record(guild.id, user.id)
+                await self.remove_muted_role(member)
+                await get_executor().timeout(member, None, reason="Hết thời hạn mute")
             except (discord.NotFound, discord.Forbidden):
                 pass
+        await get_store().remove_mute(guild_id, user_id)
     
     @app_commands.command(name="vrwarn", description="Cảnh cáo một người dùng")
     @app_commands.describe(
@@ -318,11 +308,8 @@ class ModerationCog(commands.Cog):
             )
     
     async def remove_ban_record(self, guild_id: int, user_id: int) -> None:
-        data = await JSONStorage.load("ban-mute.json")
-        if "bans" in data and str(guild_id) in data["bans"]:
-            if str(user_id) in data["bans"][str(guild_id)]:
-                del data["bans"][str(guild_id)][str(user_id)]
-                await JSONStorage.save("ban-mute.json", data)
+        get_scheduler().cancel("ban", guild_id, user_id)
+        await get_store().remove_ban(guild_id, user_id)
     
     @app_commands.command(name="vrunban", description="Gỡ cấm một người dùng")
     @app_commands.describe(
@@ -351,9 +338,11 @@ class ModerationCog(commands.Cog):
             )
             return
         
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         try:
             user = await self.bot.fetch_user(uid)
-            await interaction.guild.unban(user, reason=reason or "Không có lý do")
+            await get_executor().unban(interaction.guild, user, reason=reason or "Không có lý do")
             
             await self.remove_ban_record(interaction.guild.id, uid)
             
@@ -366,19 +355,19 @@ class ModerationCog(commands.Cog):
             embed.add_field(name="🛡️ Người thực hiện", value=interaction.user.mention, inline=True)
             embed.add_field(name="📝 Lý do", value=reason or "Không có lý do", inline=False)
             
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.success(f"Đã unban {user.name}"),
                 ephemeral=True
             )
             await self.send_log(interaction.guild, embed)
             
         except discord.NotFound:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error("Người dùng không tìm thấy hoặc chưa bị cấm."),
                 ephemeral=True
             )
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error("Tôi không có quyền gỡ cấm người dùng này."),
                 ephemeral=True
             )
@@ -401,9 +390,11 @@ class ModerationCog(commands.Cog):
             )
             return
         
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        
         try:
             await self.remove_muted_role(user)
-            await user.timeout(None, reason=reason or "Không có lý do")
+            await get_executor().timeout(user, None, reason=reason or "Không có lý do")
             
             await self.remove_mute_record(interaction.guild.id, user.id)
             
@@ -417,14 +408,14 @@ class ModerationCog(commands.Cog):
             embed.add_field(name="📝 Lý do", value=reason or "Không có lý do", inline=False)
             embed.set_thumbnail(url=user.display_avatar.url if user.display_avatar else None)
             
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.success(f"Đã unmute {user.mention}"),
                 ephemeral=True
             )
             await self.send_log(interaction.guild, embed)
             
         except discord.Forbidden:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 embed=EmbedBuilder.error("Tôi không có quyền gỡ mute người dùng này."),
                 ephemeral=True
             )
@@ -447,38 +438,15 @@ class ModerationCog(commands.Cog):
             )
             return
         
-        data = await JSONStorage.load("warn.json")
-        
-        guild_id = str(interaction.guild.id)
-        user_id = str(user.id)
-        
-        if "warnings" not in data:
-            data["warnings"] = {}
-        
-        if guild_id not in data["warnings"] or user_id not in data["warnings"][guild_id]:
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error("Người dùng này không có cảnh cáo nào."),
-                ephemeral=True
-            )
-            return
+        remaining = await get_store().pop_warning(interaction.guild.id, user.id)
         
-        warnings = data["warnings"][guild_id][user_id]
-        if not warnings:
+        if remaining is None:
             await interaction.response.send_message(
                 embed=EmbedBuilder.error("Người dùng này không có cảnh cáo nào."),
                 ephemeral=True
             )
             return
         
-        removed_warn = warnings.pop()
-        
-        if not warnings:
-            del data["warnings"][guild_id][user_id]
-        
-        await JSONStorage.save("warn.json", data)
-        
-        remaining = len(warnings)
-        
         embed = discord.Embed(
             title="✅ UnWarn",
             color=discord.Color.green(),
@@ -522,29 +490,29 @@ class ModerationCog(commands.Cog):
         if not interaction.guild:
             return
         
-        config = await self.get_guild_config(interaction.guild.id)
-        added = []
-        
-        if role:
-            if "bypass_roles" not in config:
-                config["bypass_roles"] = []
-            if role.id not in config["bypass_roles"]:
-                config["bypass_roles"].append(role.id)
-                added.append(f"Role: {role.mention}")
-        
-        if user:
-            if "bypass_users" not in config:
-                config["bypass_users"] = []
-            if user.id not in config["bypass_users"]:
-                config["bypass_users"].append(user.id)
-                added.append(f"User: {user.mention}")
-        
-        if channel:
-            if "bypass_channels" not in config:
-                config["bypass_channels"] = []
-            if channel.id not in config["bypass_channels"]:
-                config["bypass_channels"].append(channel.id)
-                added.append(f"Channel: {channel.mention}")
+        async with self.edit_guild_config(interaction.guild.id) as config:
+            added = []
+            
+            if role:
+                if "bypass_roles" not in config:
+                    config["bypass_roles"] = []
+                if role.id not in config["bypass_roles"]:
+                    config["bypass_roles"].append(role.id)
+                    added.append(f"Role: {role.mention}")
+            
+            if user:
+                if "bypass_users" not in config:
+                    config["bypass_users"] = []
+                if user.id not in config["bypass_users"]:
+                    config["bypass_users"].append(user.id)
+                    added.append(f"User: {user.mention}")
+            
+            if channel:
+                if "bypass_channels" not in config:
+                    config["bypass_channels"] = []
+                if channel.id not in config["bypass_channels"]:
+                    config["bypass_channels"].append(channel.id)
+                    added.append(f"Channel: {channel.mention}")
         
         if not added:
             await interaction.response.send_message(
@@ -553,7 +521,7 @@ class ModerationCog(commands.Cog):
             )
             return
         
-        await self.save_guild_config(interaction.guild.id, config)
+        BypassPolicy.invalidate(interaction.guild.id)
         
         embed = EmbedBuilder.config_update(
             "Bypass",
@@ -594,23 +562,23 @@ class ModerationCog(commands.Cog):
         if not interaction.guild:
             return
         
-        config = await self.get_guild_config(interaction.guild.id)
-        removed = []
-        
-        if role:
-            if "bypass_roles" in config and role.id in config["bypass_roles"]:
-                config["bypass_roles"].remove(role.id)
-                removed.append(f"Role: {role.mention}")
-        
-        if user:
-            if "bypass_users" in config and user.id in config["bypass_users"]:
-                config["bypass_users"].remove(user.id)
-                removed.append(f"User: {user.mention}")
-        
-        if channel:
-            if "bypass_channels" in config and channel.id in config["bypass_channels"]:
-                config["bypass_channels"].remove(channel.id)
-                removed.append(f"Channel: {channel.mention}")
+        async with self.edit_guild_config(interaction.guild.id) as config:
+            removed = []
+            
+            if role:
+                if "bypass_roles" in config and role.id in config["bypass_roles"]:
+                    config["bypass_roles"].remove(role.id)
+                    removed.append(f"Role: {role.mention}")
+            
+            if user:
+                if "bypass_users" in config and user.id in config["bypass_users"]:
+                    config["bypass_users"].remove(user.id)
+                    removed.append(f"User: {user.mention}")
+            
+            if channel:
+                if "bypass_channels" in config and channel.id in config["bypass_channels"]:
+                    config["bypass_channels"].remove(channel.id)
+                    removed.append(f"Channel: {channel.mention}")
         
         if not removed:
             await interaction.response.send_message(
@@ -619,7 +587,7 @@ class ModerationCog(commands.Cog):
             )
             return
         
-        await self.save_guild_config(interaction.guild.id, config)
+        BypassPolicy.invalidate(interaction.guild.id)
         
         embed = EmbedBuilder.config_update(
             "Xóa Bypass",
@@ -630,12 +598,257 @@ class ModerationCog(commands.Cog):
         await interaction.response.send_message(embed=embed)
         await self.send_log(interaction.guild, embed)
     
+    @app_commands.command(name="vrblock", description="Thêm từ cấm/link cấm/domain scam riêng cho server")
+    @app_commands.describe(
+        word="Từ cần chặn (tùy chọn)",
+        action="Hành động khi phát hiện từ cấm (mặc định: warn)",
+        duration="Thời hạn mute/ban cho từ cấm (s/m/h/d/w/mo) - để trống nếu vĩnh viễn",
+        link="Link cần chặn (tùy chọn)",
+        domain="Domain scam cần chặn (tùy chọn)"
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="warn", value="warn"),
+        app_commands.Choice(name="mute", value="mute"),
+        app_commands.Choice(name="ban", value="ban")
+    ])
+    async def vrblock(
+        self,
+        interaction: discord.Interaction,
+        word: Optional[str] = None,
+        action: str = "warn",
+        duration: Optional[str] = None,
+        link: Optional[str] = None,
+        domain: Optional[str] = None
+    ):
+        if not await self.is_authorized(interaction.user.id):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Bạn không có quyền sử dụng lệnh này."),
+                ephemeral=True
+            )
+            return
+        
+        if not word and not link and not domain:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Vui lòng nhập ít nhất một giá trị (word, link hoặc domain)."),
+                ephemeral=True
+            )
+            return
+        
+        if duration and not parse_duration(duration):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Định dạng thời hạn không hợp lệ. Sử dụng: s, m, h, d, w, mo"),
+                ephemeral=True
+            )
+            return
+        
+        if not interaction.guild:
+            return
+        
+        async with JSONStorage.transaction(BLOCKLIST_FILE) as data:
+            section = data.get("guilds", {}).get(str(interaction.guild.id))
+            is_new_section = section is None
+            if is_new_section:
+                section = {}
+            added = []
+            
+            if word:
+                word = word.strip().lower()
+                section.setdefault("blocked_words", {})[word] = {"action": action, "time": duration}
+                added.append(f"Từ cấm: `{word}` ({action}, {format_duration(duration)})")
+            
+            if link:
+                link = link.strip().lower()
+                if link not in section.get("blocked_links", []):
+                    section.setdefault("blocked_links", []).append(link)
+                    added.append(f"Link: `{link}`")
+            
+            if domain:
+                domain = domain.strip().lower()
+                if domain not in section.get("scam_domains", []):
+                    section.setdefault("scam_domains", []).append(domain)
+                    added.append(f"Domain scam: `{domain}`")
+            
+            if added and is_new_section:
+                data.setdefault("guilds", {})[str(interaction.guild.id)] = section
+        
+        if not added:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Các giá trị đã có trong danh sách chặn."),
+                ephemeral=True
+            )
+            return
+        
+        FilterRegistry.invalidate(interaction.guild.id)
+        
+        embed = EmbedBuilder.config_update(
+            "Danh Sách Chặn",
+            f"Đã thêm vào danh sách chặn:\n" + "\n".join(added),
+            interaction.user
+        )
+        
+        await interaction.response.send_message(embed=embed)
+        await self.send_log(interaction.guild, embed)
+    
+    @app_commands.command(name="vrunblock", description="Xóa từ cấm/link cấm/domain scam riêng của server")
+    @app_commands.describe(
+        word="Từ cần bỏ chặn (tùy chọn)",
+        link="Link cần bỏ chặn (tùy chọn)",
+        domain="Domain scam cần bỏ chặn (tùy chọn)"
+    )
+    async def vrunblock(
+        self,
+        interaction: discord.Interaction,
+        word: Optional[str] = None,
+        link: Optional[str] = None,
+        domain: Optional[str] = None
+    ):
+        if not await self.is_authorized(interaction.user.id):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Bạn không có quyền sử dụng lệnh này."),
+                ephemeral=True
+            )
+            return
+        
+        if not word and not link and not domain:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Vui lòng nhập ít nhất một giá trị (word, link hoặc domain)."),
+                ephemeral=True
+            )
+            return
+        
+        if not interaction.guild:
+            return
+        
+        async with JSONStorage.transaction(BLOCKLIST_FILE) as data:
+            section = data.get("guilds", {}).get(str(interaction.guild.id), {})
+            removed = []
+            
+            if word:
+                word = word.strip().lower()
+                if section.get("blocked_words", {}).pop(word, None) is not None:
+                    removed.append(f"Từ cấm: `{word}`")
+            
+            if link:
+                link = link.strip().lower()
+                if link in section.get("blocked_links", []):
+                    section["blocked_links"].remove(link)
+                    removed.append(f"Link: `{link}`")
+            
+            if domain:
+                domain = domain.strip().lower()
+                if domain in section.get("scam_domains", []):
+                    section["scam_domains"].remove(domain)
+                    removed.append(f"Domain scam: `{domain}`")
+        
+        if not removed:
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Các giá trị không có trong danh sách chặn của server."),
+                ephemeral=True
+            )
+            return
+        
+        FilterRegistry.invalidate(interaction.guild.id)
+        
+        embed = EmbedBuilder.config_update(
+            "Xóa Danh Sách Chặn",
+            f"Đã xóa khỏi danh sách chặn:\n" + "\n".join(removed),
+            interaction.user
+        )
+        
+        await interaction.response.send_message(embed=embed)
+        await self.send_log(interaction.guild, embed)
+    
+    @app_commands.command(name="vrspam", description="Xem hoặc chỉnh ngưỡng chống spam riêng cho server")
+    @app_commands.describe(
+        setting="Ngưỡng cần chỉnh (để trống để xem cấu hình hiện tại)",
+        value="Giá trị mới (để trống để trả về mặc định)"
+    )
+    @app_commands.choices(setting=[
+        app_commands.Choice(name="spam_threshold", value="spam_threshold"),
+        app_commands.Choice(name="spam_interval", value="spam_interval"),
+        app_commands.Choice(name="emoji_threshold", value="emoji_threshold"),
+        app_commands.Choice(name="mention_threshold", value="mention_threshold"),
+        app_commands.Choice(name="channel_hop_threshold", value="channel_hop_threshold"),
+        app_commands.Choice(name="channel_hop_interval", value="channel_hop_interval"),
+        app_commands.Choice(name="duplicate_threshold", value="duplicate_threshold"),
+        app_commands.Choice(name="duplicate_distance", value="duplicate_distance"),
+        app_commands.Choice(name="max_message_length", value="max_message_length"),
+        app_commands.Choice(name="rate_limit_messages", value="rate_limit_messages"),
+        app_commands.Choice(name="rate_limit_interval", value="rate_limit_interval"),
+        app_commands.Choice(name="channel_rate_limit_messages", value="channel_rate_limit_messages"),
+        app_commands.Choice(name="channel_rate_limit_interval", value="channel_rate_limit_interval"),
+        app_commands.Choice(name="guild_rate_limit_messages", value="guild_rate_limit_messages"),
+        app_commands.Choice(name="guild_rate_limit_interval", value="guild_rate_limit_interval"),
+        app_commands.Choice(name="raid_author_threshold", value="raid_author_threshold"),
+        app_commands.Choice(name="raid_account_age_days", value="raid_account_age_days"),
+        app_commands.Choice(name="raid_join_age_hours", value="raid_join_age_hours")
+    ])
+    async def vrspam(
+        self,
+        interaction: discord.Interaction,
+        setting: Optional[str] = None,
+        value: Optional[int] = None
+    ):
+        if not await self.is_authorized(interaction.user.id):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("Bạn không có quyền sử dụng lệnh này."),
+                ephemeral=True
+            )
+            return
+        
+        if not setting:
+            settings = await SpamProfiles.get(interaction.guild.id)
+            embed = discord.Embed(
+                title="🛡️ Cấu Hình Chống Spam",
+                color=discord.Color.blue()
+            )
+            embed.description = "\n".join(
+                f"**{label}** (`{name}`): {getattr(settings, name)}"
+                for name, label in SETTING_LABELS.items()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if value is not None:
+            low, high = setting_range(setting)
+            if not low <= value <= high:
+                await interaction.response.send_message(
+                    embed=EmbedBuilder.error(f"Giá trị phải nằm trong khoảng {low} - {high}."),
+                    ephemeral=True
+                )
+                return
+        
+        async with self.edit_guild_config(interaction.guild.id) as config:
+            profile = config.setdefault("spam_profile", {})
+            if value is None:
+                profile.pop(setting, None)
+            else:
+                profile[setting] = value
+            if not profile:
+                config.pop("spam_profile", None)
+            settings = compile_settings(profile)
+        
+        SpamProfiles.invalidate(interaction.guild.id)
+        
+        embed = EmbedBuilder.config_update(
+            SETTING_LABELS[setting],
+            f"`{getattr(settings, setting)}`" + (" (mặc định)" if value is None else ""),
+            interaction.user
+        )
+        
+        await interaction.response.send_message(embed=embed)
+        await self.send_log(interaction.guild, embed)
+    
     @app_commands.command(name="vrsetlog", description="Thiết lập channel log")
-    @app_commands.describe(channel="Channel để gửi log")
+    @app_commands.describe(
+        channel="Channel để gửi log",
+        webhook="URL webhook để gửi log gộp (tùy chọn)"
+    )
     async def vrsetlog(
         self,
         interaction: discord.Interaction,
-        channel: discord.TextChannel
+        channel: discord.TextChannel,
+        webhook: Optional[str] = None
     ):
         if not await self.is_authorized(interaction.user.id):
             await interaction.response.send_message(
@@ -644,17 +857,27 @@ class ModerationCog(commands.Cog):
             )
             return
         
-        config = await self.get_guild_config(interaction.guild.id)
-        config["log_channel"] = channel.id
-        await self.save_guild_config(interaction.guild.id, config)
+        if webhook is not None and not is_webhook_url(webhook.strip()):
+            await interaction.response.send_message(
+                embed=EmbedBuilder.error("URL webhook không hợp lệ."),
+                ephemeral=True
+            )
+            return
+        
+        async with self.edit_guild_config(interaction.guild.id) as config:
+            config["log_channel"] = channel.id
+            if webhook is not None:
+                config["log_webhook"] = webhook.strip()
+            else:
+                config.pop("log_webhook", None)
         
         embed = EmbedBuilder.config_update(
             "Log Channel",
-            f"{channel.mention}",
+            f"{channel.mention}" + (" (qua webhook)" if webhook is not None else ""),
             interaction.user
         )
         
-        await interaction.response.send_message(embed=embed)
+        await interaction.response.send_message(embed=embed, ephemeral=webhook is not None)
         await self.send_log(interaction.guild, embed)
     
     @app_commands.command(name="vrsetmutedrole", description="Thiết lập role muted")
@@ -671,9 +894,8 @@ class ModerationCog(commands.Cog):
             )
             return
         
-        config = await self.get_guild_config(interaction.guild.id)
-        config["muted_role"] = role.id
-        await self.save_guild_config(interaction.guild.id, config)
+        async with self.edit_guild_config(interaction.guild.id) as config:
+            config["muted_role"] = role.id
         
         embed = EmbedBuilder.config_update(
             "Muted Role",
@@ -684,6 +906,24 @@ class ModerationCog(commands.Cog):
         await interaction.response.send_message(embed=embed)
         await self.send_log(interaction.guild, embed)
     
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            BypassPolicy.forget_member(after.guild.id, after.id)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        BypassPolicy.forget_member(member.guild.id, member.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.permissions != after.permissions:
+            BypassPolicy.forget_members(after.guild.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        BypassPolicy.forget_members(role.guild.id)
+    
     @vrban.error
     @vrunban.error
     @vrmute.error
@@ -692,14 +932,20 @@ class ModerationCog(commands.Cog):
     @vrunwarn.error
     @vrbypass.error
     @vrunbypass.error
+    @vrspam.error
     @vrsetlog.error
     @vrsetmutedrole.error
+    @vrblock.error
+    @vrunblock.error
     async def command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        embed = EmbedBuilder.error(f"Đã xảy ra lỗi: {str(error)}")
         if not interaction.response.is_done():
-            await interaction.response.send_message(
-                embed=EmbedBuilder.error(f"Đã xảy ra lỗi: {str(error)}"),
-                ephemeral=True
-            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        else:
+            try:
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            except discord.HTTPException:
+                pass
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(ModerationCog(bot))
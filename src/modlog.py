@@ -0,0 +1,134 @@
+import asyncio
+import re
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from src.executor import get_executor
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_BUFFERED_EMBEDS = 1000
+FLUSH_INTERVAL = 2.0
+
+WEBHOOK_URL_PATTERN = re.compile(r'^https://(?:ptb\.|canary\.)?discord(?:app)?\.com/api/webhooks/\d{17,20}/[\w\-.]{60,}$')
+
+def is_webhook_url(url: str) -> bool:
+    return WEBHOOK_URL_PATTERN.match(url) is not None
+
+def take_batch(embeds: Deque[discord.Embed]) -> List[discord.Embed]:
+    batch = []
+    size = 0
+    while embeds and len(batch) < MAX_EMBEDS_PER_MESSAGE:
+        length = len(embeds[0])
+        if batch and size + length > MAX_EMBED_CHARS_PER_MESSAGE:
+            break
+        batch.append(embeds.popleft())
+        size += length
+    return batch
+
+class LogBuffer:
+    __slots__ = ("embeds", "channel", "webhook_url", "full", "task")
+    
+    def __init__(self):
+        self.embeds: Deque[discord.Embed] = deque(maxlen=MAX_BUFFERED_EMBEDS)
+        self.channel: Optional[discord.abc.Messageable] = None
+        self.webhook_url: Optional[str] = None
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+class ModLogSender:
+    def __init__(self, bot: commands.Bot, interval: float = FLUSH_INTERVAL):
+        self.bot = bot
+        self.interval = interval
+        self._buffers: Dict[int, LogBuffer] = {}
+        self._webhooks: Dict[str, discord.Webhook] = {}
+        self.metrics: Dict[str, int] = {"queued": 0, "messages": 0, "dropped": 0}
+    
+    def enqueue(self, guild: discord.Guild, guild_config: Dict[str, Any], embed: discord.Embed) -> None:
+        webhook_url = guild_config.get("log_webhook")
+        channel = None
+        if not webhook_url:
+            log_channel_id = guild_config.get("log_channel")
+            channel = guild.get_channel(int(log_channel_id)) if log_channel_id else None
+            if channel is None:
+                return
+        
+        buffer = self._buffers.get(guild.id)
+        if buffer is None:
+            buffer = self._buffers[guild.id] = LogBuffer()
+        
+        if len(buffer.embeds) == MAX_BUFFERED_EMBEDS:
+            self.metrics["dropped"] += 1
+        buffer.embeds.append(embed)
+        buffer.channel = channel
+        buffer.webhook_url = webhook_url
+        self.metrics["queued"] += 1
+        
+        if len(buffer.embeds) >= MAX_EMBEDS_PER_MESSAGE:
+            buffer.full.set()
+        if buffer.task is None:
+            buffer.task = asyncio.create_task(self._run(guild.id, buffer))
+    
+    async def _run(self, guild_id: int, buffer: LogBuffer) -> None:
+        try:
+            while buffer.embeds:
+                try:
+                    await asyncio.wait_for(buffer.full.wait(), timeout=self.interval)
+                    partial = False
+                except asyncio.TimeoutError:
+                    partial = True
+                buffer.full.clear()
+                self._flush(buffer, partial)
+        finally:
+            buffer.task = None
+            buffer.full.clear()
+            if not buffer.embeds:
+                self._buffers.pop(guild_id, None)
+    
+    def _flush(self, buffer: LogBuffer, partial: bool = True) -> None:
+        while len(buffer.embeds) >= (1 if partial else MAX_EMBEDS_PER_MESSAGE):
+            batch = take_batch(buffer.embeds)
+            self.metrics["messages"] += 1
+            if buffer.webhook_url:
+                self._send_webhook(buffer.webhook_url, batch)
+            elif buffer.channel is not None:
+                get_executor().send_message(buffer.channel, embeds=batch)
+    
+    def _send_webhook(self, url: str, embeds: List[discord.Embed]) -> None:
+        webhook = self._webhooks.get(url)
+        if webhook is None:
+            try:
+                webhook = discord.Webhook.from_url(url, client=self.bot)
+            except ValueError:
+                return
+            self._webhooks[url] = webhook
+        
+        get_executor().submit(("webhook", webhook.id), lambda: webhook.send(embeds=embeds), "webhook")
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.metrics,
+            "pending": sum(len(buffer.embeds) for buffer in self._buffers.values())
+        }
+    
+    async def close(self) -> None:
+        for buffer in list(self._buffers.values()):
+            if buffer.task is not None:
+                buffer.task.cancel()
+            self._flush(buffer)
+        self._buffers.clear()
+
+_modlog: Optional[ModLogSender] = None
+
+def configure_modlog(bot: commands.Bot) -> ModLogSender:
+    global _modlog
+    _modlog = ModLogSender(bot)
+    return _modlog
+
+def get_modlog() -> ModLogSender:
+    if _modlog is None:
+        raise RuntimeError("ModLogSender chưa được khởi tạo")
+    return _modlog
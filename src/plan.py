@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+StepFactory = Callable[[], Awaitable[Any]]
+ErrorReporter = Callable[[str], Awaitable[None]]
+
+class ActionPlan:
+    __slots__ = ("label", "steps", "on_error")
+    
+    def __init__(self, label: str, on_error: Optional[ErrorReporter] = None):
+        self.label = label
+        self.steps: List[Tuple[str, StepFactory]] = []
+        self.on_error = on_error
+    
+    def add(self, name: str, factory: StepFactory) -> "ActionPlan":
+        self.steps.append((name, factory))
+        return self
+    
+    async def run(self) -> Dict[str, BaseException]:
+        results = await asyncio.gather(*(factory() for _, factory in self.steps), return_exceptions=True)
+        
+        failures = {}
+        for (name, _), result in zip(self.steps, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                failures[name] = result
+                print(f"Lỗi ở bước {name} của {self.label}: {result}")
+        
+        if failures and self.on_error is not None:
+            details = "\n".join(f"`{name}`: {error}" for name, error in failures.items())
+            try:
+                await self.on_error(f"Một số bước của {self.label} thất bại:\n{details}")
+            except Exception as e:
+                print(f"Không thể báo lỗi của {self.label}: {e}")
+        return failures
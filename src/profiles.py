@@ -0,0 +1,103 @@
+from typing import Any, Dict, NamedTuple
+
+from src.utils import JSONStorage
+
+class SpamSettings(NamedTuple):
+    spam_threshold: int = 5
+    spam_interval: int = 5
+    emoji_threshold: int = 10
+    mention_threshold: int = 5
+    channel_hop_threshold: int = 5
+    channel_hop_interval: int = 10
+    duplicate_threshold: int = 3
+    duplicate_distance: int = 14
+    max_message_length: int = 2000
+    rate_limit_messages: int = 10
+    rate_limit_interval: int = 5
+    channel_rate_limit_messages: int = 0
+    channel_rate_limit_interval: int = 10
+    guild_rate_limit_messages: int = 0
+    guild_rate_limit_interval: int = 10
+    raid_author_threshold: int = 8
+    raid_account_age_days: int = 7
+    raid_join_age_hours: int = 24
+    
+    @property
+    def idle_timeout(self) -> float:
+        return max(
+            self.spam_interval, self.rate_limit_interval, self.channel_hop_interval,
+            self.channel_rate_limit_interval, self.guild_rate_limit_interval
+        )
+
+DEFAULT_SETTINGS = SpamSettings()
+
+SETTING_LABELS = {
+    "spam_threshold": "Số tin nhắn tối đa (spam)",
+    "spam_interval": "Khoảng thời gian spam (giây)",
+    "emoji_threshold": "Số emoji tối đa / tin nhắn",
+    "mention_threshold": "Số mention tối đa / tin nhắn",
+    "channel_hop_threshold": "Số kênh nhảy liên tục",
+    "channel_hop_interval": "Khoảng thời gian nhảy kênh (giây)",
+    "duplicate_threshold": "Số tin nhắn trùng lặp",
+    "duplicate_distance": "Độ khác biệt tối đa của tin trùng lặp (0-64 bit)",
+    "max_message_length": "Độ dài tin nhắn tối đa",
+    "rate_limit_messages": "Giới hạn tin nhắn cá nhân",
+    "rate_limit_interval": "Khoảng giới hạn cá nhân (giây)",
+    "channel_rate_limit_messages": "Giới hạn tin nhắn / kênh (0 = tắt)",
+    "channel_rate_limit_interval": "Khoảng giới hạn kênh (giây)",
+    "guild_rate_limit_messages": "Giới hạn tin nhắn / server (0 = tắt)",
+    "guild_rate_limit_interval": "Khoảng giới hạn server (giây)",
+    "raid_author_threshold": "Số tài khoản tối thiểu để tính là raid",
+    "raid_account_age_days": "Tuổi tài khoản tối đa để tính vào raid (ngày, 0 = bỏ qua)",
+    "raid_join_age_hours": "Thời gian vào server tối đa để tính vào raid (giờ, 0 = bỏ qua)",
+}
+
+SETTING_RANGES = {
+    "duplicate_distance": (0, 64),
+    "channel_rate_limit_messages": (0, 100000),
+    "guild_rate_limit_messages": (0, 100000),
+    "raid_account_age_days": (0, 3650),
+    "raid_join_age_hours": (0, 8760),
+}
+
+def setting_range(name: str) -> tuple:
+    return SETTING_RANGES.get(name, (1, 100000))
+
+def compile_settings(profile: Dict[str, Any]) -> SpamSettings:
+    values = {}
+    for name, value in profile.items():
+        if name not in SETTING_LABELS:
+            continue
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            continue
+        low, high = setting_range(name)
+        if low <= value <= high:
+            values[name] = value
+    return DEFAULT_SETTINGS._replace(**values) if values else DEFAULT_SETTINGS
+
+class SpamProfiles:
+    _settings: Dict[int, SpamSettings] = {}
+    
+    @classmethod
+    async def get(cls, guild_id: int) -> SpamSettings:
+        settings = cls._settings.get(guild_id)
+        if settings is None:
+            config = await JSONStorage.load("config.json")
+            guild_config = config.get("guilds", {}).get(str(guild_id), {})
+            settings = compile_settings(guild_config.get("spam_profile", {}))
+            cls._settings[guild_id] = settings
+        return settings
+    
+    @classmethod
+    def cached(cls, guild_id: int) -> SpamSettings:
+        return cls._settings.get(guild_id, DEFAULT_SETTINGS)
+    
+    @classmethod
+    def max_idle_timeout(cls) -> float:
+        return max([DEFAULT_SETTINGS.idle_timeout, *(settings.idle_timeout for settings in cls._settings.values())])
+    
+    @classmethod
+    def invalidate(cls, guild_id: int) -> None:
+        cls._settings.pop(guild_id, None)
@@ -0,0 +1,133 @@
+import asyncio
+from datetime import timedelta
+from typing import Callable, List, Optional, Tuple
+
+import discord
+
+from src.executor import get_executor
+
+MAX_CHANNEL_CONCURRENCY = 5
+BULK_DELETE_LIMIT = 100
+HISTORY_PAGE_SIZE = 100
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+class PurgeProgress:
+    __slots__ = ("channels_total", "channels_done", "scanned", "deleted", "bulk_calls", "single_calls", "history_calls", "failed")
+    
+    def __init__(self, channels_total: int = 0):
+        self.channels_total = channels_total
+        self.channels_done = 0
+        self.scanned = 0
+        self.deleted = 0
+        self.bulk_calls = 0
+        self.single_calls = 0
+        self.history_calls = 0
+        self.failed = 0
+    
+    @property
+    def api_calls(self) -> int:
+        return self.bulk_calls + self.single_calls + self.history_calls
+    
+    def summary(self) -> str:
+        return (
+            f"{self.channels_done}/{self.channels_total} kênh | quét {self.scanned} | xóa {self.deleted} | "
+            f"{self.api_calls} API call ({self.bulk_calls} bulk, {self.single_calls} đơn, {self.history_calls} đọc) | lỗi {self.failed}"
+        )
+
+ProgressCallback = Callable[[PurgeProgress], None]
+
+def split_by_age(messages: List[discord.Message]) -> Tuple[List[discord.Message], List[discord.Message]]:
+    cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+    recent = [message for message in messages if message.created_at > cutoff]
+    old = [message for message in messages if message.created_at <= cutoff]
+    return recent, old
+
+async def delete_individually(messages: List[discord.Message], progress: PurgeProgress) -> None:
+    executor = get_executor()
+    futures = [executor.delete_message(message) for message in messages]
+    progress.single_calls += len(futures)
+    
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    for result in results:
+        if isinstance(result, discord.NotFound):
+            continue
+        if isinstance(result, Exception):
+            progress.failed += 1
+        else:
+            progress.deleted += 1
+
+async def delete_in_bulk(channel: discord.abc.Messageable, batch: List[discord.Message], progress: PurgeProgress) -> None:
+    progress.bulk_calls += 1
+    try:
+        await get_executor().bulk_delete(channel, batch)
+    except discord.Forbidden:
+        progress.failed += len(batch)
+    except discord.HTTPException:
+        await delete_individually(batch, progress)
+    except Exception:
+        progress.failed += len(batch)
+    else:
+        progress.deleted += len(batch)
+
+async def purge_messages(channel: discord.abc.Messageable, messages: List[discord.Message], progress: PurgeProgress) -> None:
+    recent, old = split_by_age(messages)
+    
+    batches = [recent[i:i + BULK_DELETE_LIMIT] for i in range(0, len(recent), BULK_DELETE_LIMIT)]
+    if batches and len(batches[-1]) == 1:
+        old.append(batches.pop()[0])
+    
+    await asyncio.gather(
+        *(delete_in_bulk(channel, batch, progress) for batch in batches),
+        delete_individually(old, progress)
+    )
+
+async def purge_channel(
+    channel: discord.TextChannel,
+    user_id: int,
+    limit: int,
+    progress: PurgeProgress
+) -> None:
+    matches = []
+    scanned = 0
+    try:
+        async for message in channel.history(limit=limit):
+            scanned += 1
+            if message.author.id == user_id:
+                matches.append(message)
+    except discord.Forbidden:
+        pass
+    except discord.HTTPException:
+        progress.failed += 1
+    
+    progress.scanned += scanned
+    progress.history_calls += max(1, -(-scanned // HISTORY_PAGE_SIZE))
+    
+    if matches:
+        await purge_messages(channel, matches, progress)
+
+async def purge_user_messages(
+    guild: discord.Guild,
+    user_id: int,
+    limit: int = HISTORY_PAGE_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+    concurrency: int = MAX_CHANNEL_CONCURRENCY
+) -> PurgeProgress:
+    channels = [
+        channel for channel in guild.text_channels
+        if channel.permissions_for(guild.me).read_message_history
+    ] if guild.me else list(guild.text_channels)
+    
+    progress = PurgeProgress(len(channels))
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(channel: discord.TextChannel) -> None:
+        async with semaphore:
+            try:
+                await purge_channel(channel, user_id, limit, progress)
+            finally:
+                progress.channels_done += 1
+                if on_progress is not None:
+                    on_progress(progress)
+    
+    await asyncio.gather(*(run(channel) for channel in channels))
+    return progress
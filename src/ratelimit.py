@@ -0,0 +1,64 @@
+import sys
+import time
+from typing import Dict, Hashable, Optional
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+    
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+class RateLimiter:
+    def __init__(self):
+        self.buckets: Dict[Hashable, TokenBucket] = {}
+    
+    def __len__(self) -> int:
+        return len(self.buckets)
+    
+    def consume(self, key: Hashable, rate: float, burst: float, now: Optional[float] = None, cost: float = 1.0) -> bool:
+        if now is None:
+            now = time.monotonic()
+        
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            allowed = burst >= cost
+            self.buckets[key] = TokenBucket(burst - cost if allowed else burst, now)
+            return allowed
+        
+        if now < bucket.updated:
+            return False
+        
+        tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+        bucket.updated = now
+        if tokens >= cost:
+            bucket.tokens = tokens - cost
+            return True
+        
+        bucket.tokens = tokens
+        return False
+    
+    def block(self, key: Hashable, seconds: float, burst: float = 1.0, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.monotonic()
+        self.buckets[key] = TokenBucket(burst, now + seconds)
+    
+    def is_blocked(self, key: Hashable, now: Optional[float] = None) -> bool:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now < bucket.updated
+    
+    def sweep(self, max_idle: float, now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.monotonic()
+        cutoff = now - max_idle
+        stale = [key for key, bucket in self.buckets.items() if bucket.updated < cutoff]
+        for key in stale:
+            del self.buckets[key]
+        return len(stale)
+    
+    def approximate_size(self) -> int:
+        return sys.getsizeof(self.buckets) + len(self.buckets) * (sys.getsizeof(TokenBucket(0.0, 0.0)) + 2 * 24 + 80)
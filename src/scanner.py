@@ -0,0 +1,48 @@
+import re
+from typing import List
+
+URL_PATTERN = re.compile(
+    r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+[^\s]*|'
+    r'(?:www\.)?[-\w]+\.(?:com|net|org|io|gg|co|ru|site|gift|xyz|info|biz)[^\s]*',
+    re.IGNORECASE
+)
+
+DISCORD_TOKEN_PATTERN = re.compile(
+    r'[MN][A-Za-z\d]{23,}\.[\w-]{6}\.[\w-]{27}',
+    re.IGNORECASE
+)
+
+SUSPICIOUS_PATTERNS = [
+    re.compile(r'free\s*nitro', re.IGNORECASE),
+    re.compile(r'discord\s*nitro\s*free', re.IGNORECASE),
+    re.compile(r'claim\s*your\s*(?:free\s*)?(?:nitro|gift)', re.IGNORECASE),
+    re.compile(r'steam\s*(?:gift|free|giveaway)', re.IGNORECASE),
+    re.compile(r'(?:click|get)\s*(?:here|now)\s*(?:for|to)\s*(?:free|nitro)', re.IGNORECASE),
+    re.compile(r'airdrop', re.IGNORECASE),
+    re.compile(r'crypto\s*giveaway', re.IGNORECASE),
+]
+
+SUSPICIOUS_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in SUSPICIOUS_PATTERNS),
+    re.IGNORECASE
+)
+
+class ScanResult:
+    __slots__ = ("urls", "has_token", "suspicious")
+    
+    def __init__(self, urls: List[str], has_token: bool, suspicious: bool):
+        self.urls = urls
+        self.has_token = has_token
+        self.suspicious = suspicious
+
+def may_contain_link(content: str) -> bool:
+    return "." in content or "://" in content
+
+def scan_message(content: str) -> ScanResult:
+    if not may_contain_link(content):
+        return ScanResult([], False, False)
+    
+    urls = URL_PATTERN.findall(content)
+    has_token = "." in content and DISCORD_TOKEN_PATTERN.search(content) is not None
+    suspicious = bool(urls) and SUSPICIOUS_PATTERN.search(content) is not None
+    return ScanResult(urls, has_token, suspicious)
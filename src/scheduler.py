@@ -0,0 +1,125 @@
+import asyncio
+import heapq
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from discord.ext import commands
+
+from src.storage import get_store
+
+ExpiryKey = Tuple[str, int, int]
+ExpiryHandler = Callable[[int, int], Awaitable[None]]
+
+MAX_BATCH_SIZE = 50
+MAX_SLEEP_SECONDS = 3600
+
+class ExpiryScheduler:
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._heap: List[Tuple[datetime, ExpiryKey]] = []
+        self._deadlines: Dict[ExpiryKey, datetime] = {}
+        self._handlers: Dict[str, ExpiryHandler] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.processed = 0
+    
+    def __len__(self) -> int:
+        return len(self._deadlines)
+    
+    def register(self, action: str, handler: ExpiryHandler) -> None:
+        self._handlers[action] = handler
+    
+    def schedule(self, action: str, guild_id: int, user_id: int, expiry: datetime) -> None:
+        key = (action, guild_id, user_id)
+        self._deadlines[key] = expiry
+        heapq.heappush(self._heap, (expiry, key))
+        if self._heap[0][1] == key:
+            self._wakeup.set()
+    
+    def cancel(self, action: str, guild_id: int, user_id: int) -> None:
+        self._deadlines.pop((action, guild_id, user_id), None)
+    
+    async def load(self) -> int:
+        pending = await get_store().pending_expiries()
+        for action, guild_id, user_id, expiry in pending:
+            self.schedule(action, guild_id, user_id, expiry)
+        return len(pending)
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def _pop_due(self, now: datetime) -> List[ExpiryKey]:
+        due = []
+        while self._heap and len(due) < MAX_BATCH_SIZE:
+            expiry, key = self._heap[0]
+            if self._deadlines.get(key) != expiry:
+                heapq.heappop(self._heap)
+                continue
+            if expiry > now:
+                break
+            heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+        return due
+    
+    async def _expire(self, key: ExpiryKey) -> None:
+        action, guild_id, user_id = key
+        handler = self._handlers.get(action)
+        if handler is None:
+            print(f"Không có handler cho {action}: bỏ qua hạn của {user_id} tại server {guild_id}")
+            return
+        try:
+            await handler(guild_id, user_id)
+        except Exception as e:
+            print(f"Lỗi khi gỡ {action} cho {user_id} tại server {guild_id}: {e}")
+    
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        
+        while True:
+            due = self._pop_due(datetime.utcnow())
+            if due:
+                await asyncio.gather(*(self._expire(key) for key in due))
+                self.processed += len(due)
+                continue
+            
+            self._wakeup.clear()
+            if self._heap:
+                delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                timeout = min(max(delay, 0), MAX_SLEEP_SECONDS)
+            else:
+                timeout = None
+            
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+_scheduler: Optional[ExpiryScheduler] = None
+
+async def configure_scheduler(bot: commands.Bot) -> ExpiryScheduler:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+    
+    _scheduler = ExpiryScheduler(bot)
+    return _scheduler
+
+async def stop_scheduler() -> None:
+    if _scheduler is not None:
+        await _scheduler.stop()
+
+def get_scheduler() -> ExpiryScheduler:
+    if _scheduler is None:
+        raise RuntimeError("ExpiryScheduler chưa được khởi tạo")
+    return _scheduler
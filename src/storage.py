@@ -0,0 +1,471 @@
+import json
+import asyncio
+import aiofiles
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Union
+
+from src.utils import JSONStorage, DATA_DIR
+
+ModeratorId = Union[int, str]
+PendingExpiry = Tuple[str, int, int, datetime]
+
+class ModerationStore(ABC):
+    @abstractmethod
+    async def get_warnings(self, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
+        ...
+    
+    @abstractmethod
+    async def add_warning(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, auto: bool = False) -> int:
+        ...
+    
+    @abstractmethod
+    async def pop_warning(self, guild_id: int, user_id: int) -> Optional[int]:
+        ...
+    
+    @abstractmethod
+    async def count_guild_warnings(self, guild_id: int) -> int:
+        ...
+    
+    @abstractmethod
+    async def record_ban(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        ...
+    
+    @abstractmethod
+    async def remove_ban(self, guild_id: int, user_id: int) -> None:
+        ...
+    
+    @abstractmethod
+    async def record_mute(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        ...
+    
+    @abstractmethod
+    async def remove_mute(self, guild_id: int, user_id: int) -> None:
+        ...
+    
+    @abstractmethod
+    async def pending_expiries(self) -> List[PendingExpiry]:
+        ...
+    
+    async def open(self) -> None:
+        pass
+    
+    async def close(self) -> None:
+        pass
+
+def _parse_expiry(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def _punishment_record(moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> Dict[str, Any]:
+    return {
+        "moderator_id": moderator_id,
+        "reason": reason,
+        "duration": duration,
+        "expiry": expiry.isoformat() if expiry else None,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+class JSONModerationStore(ModerationStore):
+    async def get_warnings(self, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
+        data = await JSONStorage.load("warn.json")
+        warnings = data.get("warnings", {})
+        guild_warnings = warnings.get(str(guild_id), {})
+        return guild_warnings.get(str(user_id), [])
+    
+    async def add_warning(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, auto: bool = False) -> int:
+        warning = {
+            "reason": reason,
+            "moderator_id": moderator_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "auto": auto
+        }
+        
+        async with JSONStorage.transaction("warn.json") as data:
+            user_warnings = data.setdefault("warnings", {}).setdefault(str(guild_id), {}).setdefault(str(user_id), [])
+            user_warnings.append(warning)
+            return len(user_warnings)
+    
+    async def pop_warning(self, guild_id: int, user_id: int) -> Optional[int]:
+        async with JSONStorage.transaction("warn.json") as data:
+            guild_warnings = data.get("warnings", {}).get(str(guild_id), {})
+            warnings = guild_warnings.get(str(user_id))
+            if not warnings:
+                return None
+            
+            warnings.pop()
+            
+            if not warnings:
+                del guild_warnings[str(user_id)]
+            
+            return len(warnings)
+    
+    async def count_guild_warnings(self, guild_id: int) -> int:
+        data = await JSONStorage.load("warn.json")
+        guild_warns = data.get("warnings", {}).get(str(guild_id), {})
+        return sum(len(warns) for warns in guild_warns.values())
+    
+    async def _set_record(self, section: str, guild_id: int, user_id: int, record: Dict[str, Any]) -> None:
+        async with JSONStorage.transaction("ban-mute.json") as data:
+            data.setdefault(section, {}).setdefault(str(guild_id), {})[str(user_id)] = record
+    
+    async def _remove_record(self, section: str, guild_id: int, user_id: int) -> None:
+        async with JSONStorage.transaction("ban-mute.json") as data:
+            data.get(section, {}).get(str(guild_id), {}).pop(str(user_id), None)
+    
+    async def record_ban(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        await self._set_record("bans", guild_id, user_id, _punishment_record(moderator_id, reason, duration, expiry))
+    
+    async def remove_ban(self, guild_id: int, user_id: int) -> None:
+        await self._remove_record("bans", guild_id, user_id)
+    
+    async def record_mute(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        await self._set_record("mutes", guild_id, user_id, _punishment_record(moderator_id, reason, duration, expiry))
+    
+    async def remove_mute(self, guild_id: int, user_id: int) -> None:
+        await self._remove_record("mutes", guild_id, user_id)
+    
+    async def pending_expiries(self) -> List[PendingExpiry]:
+        data = await JSONStorage.load("ban-mute.json")
+        pending = []
+        for section, action in (("bans", "ban"), ("mutes", "mute")):
+            for guild_id, users in data.get(section, {}).items():
+                for user_id, record in users.items():
+                    expiry = _parse_expiry(record.get("expiry"))
+                    if expiry is not None:
+                        pending.append((action, int(guild_id), int(user_id), expiry))
+        return pending
+
+class JournaledModerationStore(JSONModerationStore):
+    def __init__(self, journal_filename: str = "warn.journal", compact_every: int = 1000):
+        self.journal_path = os.path.join(DATA_DIR, journal_filename)
+        self.compact_every = compact_every
+        self._warnings: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._seq = 0
+        self._pending = 0
+        self._lock = asyncio.Lock()
+    
+    async def open(self) -> None:
+        snapshot = await JSONStorage.load_copy("warn.json")
+        self._warnings = snapshot.get("warnings", {})
+        self._seq = snapshot.get("journal_seq", 0)
+        self._pending = 0
+        
+        try:
+            async with aiofiles.open(self.journal_path, 'r', encoding='utf-8') as f:
+                lines = await f.readlines()
+        except FileNotFoundError:
+            lines = []
+        
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("seq", 0) <= self._seq:
+                continue
+            self._apply(event)
+            self._seq = event["seq"]
+            self._pending += 1
+    
+    def _apply(self, event: Dict[str, Any]) -> None:
+        guild_key = event["guild_id"]
+        user_key = event["user_id"]
+        
+        if event["op"] == "add":
+            self._warnings.setdefault(guild_key, {}).setdefault(user_key, []).append(event["warning"])
+        elif event["op"] == "pop":
+            warnings = self._warnings.get(guild_key, {}).get(user_key)
+            if warnings:
+                warnings.pop()
+                if not warnings:
+                    del self._warnings[guild_key][user_key]
+    
+    async def _append(self, event: Dict[str, Any]) -> None:
+        self._seq += 1
+        event["seq"] = self._seq
+        
+        async with aiofiles.open(self.journal_path, 'a', encoding='utf-8') as f:
+            await f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        
+        self._apply(event)
+        self._pending += 1
+        
+        if self._pending >= self.compact_every:
+            await self._compact()
+    
+    async def _compact(self) -> None:
+        await JSONStorage.save("warn.json", {"warnings": self._warnings, "journal_seq": self._seq})
+        await JSONStorage.flush()
+        
+        async with aiofiles.open(self.journal_path, 'w', encoding='utf-8') as f:
+            await f.write("")
+        self._pending = 0
+    
+    async def compact(self) -> None:
+        async with self._lock:
+            await self._compact()
+    
+    async def get_warnings(self, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
+        return list(self._warnings.get(str(guild_id), {}).get(str(user_id), []))
+    
+    async def add_warning(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, auto: bool = False) -> int:
+        warning = {
+            "reason": reason,
+            "moderator_id": moderator_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "auto": auto
+        }
+        
+        async with self._lock:
+            await self._append({"op": "add", "guild_id": str(guild_id), "user_id": str(user_id), "warning": warning})
+            return len(self._warnings[str(guild_id)][str(user_id)])
+    
+    async def pop_warning(self, guild_id: int, user_id: int) -> Optional[int]:
+        async with self._lock:
+            warnings = self._warnings.get(str(guild_id), {}).get(str(user_id))
+            if not warnings:
+                return None
+            
+            await self._append({"op": "pop", "guild_id": str(guild_id), "user_id": str(user_id)})
+            return len(self._warnings.get(str(guild_id), {}).get(str(user_id), []))
+    
+    async def count_guild_warnings(self, guild_id: int) -> int:
+        guild_warns = self._warnings.get(str(guild_id), {})
+        return sum(len(warns) for warns in guild_warns.values())
+    
+    async def close(self) -> None:
+        async with self._lock:
+            if self._pending:
+                await self._compact()
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS warnings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id,
+    reason TEXT,
+    timestamp TEXT,
+    auto INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_warnings_guild_user ON warnings (guild_id, user_id);
+CREATE TABLE IF NOT EXISTS bans (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id,
+    reason TEXT,
+    duration TEXT,
+    expiry TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_bans_expiry ON bans (expiry);
+CREATE TABLE IF NOT EXISTS mutes (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    moderator_id,
+    reason TEXT,
+    duration TEXT,
+    expiry TEXT,
+    timestamp TEXT,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_mutes_expiry ON mutes (expiry);
+"""
+
+class SQLiteModerationStore(ModerationStore):
+    def __init__(self, filename: str = "moderation.db"):
+        self.filepath = os.path.join(DATA_DIR, filename)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.filepath, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def _call(self, func, *args):
+        return func(self._connect(), *args)
+    
+    async def _run(self, func, *args):
+        async with self._lock:
+            return await asyncio.to_thread(self._call, func, *args)
+    
+    async def open(self) -> None:
+        if await self.migrate_from_json():
+            print("Đã chuyển dữ liệu cảnh cáo/ban/mute từ JSON sang SQLite")
+    
+    async def migrate_from_json(self) -> bool:
+        warn_data = await JSONStorage.load("warn.json")
+        ban_mute_data = await JSONStorage.load("ban-mute.json")
+        return await self._run(self._migrate, warn_data, ban_mute_data)
+    
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection, warn_data: Dict[str, Any], ban_mute_data: Dict[str, Any]) -> bool:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+            return False
+        
+        with conn:
+            for guild_id, users in warn_data.get("warnings", {}).items():
+                for user_id, warnings in users.items():
+                    conn.executemany(
+                        "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, timestamp, auto) VALUES (?, ?, ?, ?, ?, ?)",
+                        [
+                            (int(guild_id), int(user_id), w.get("moderator_id"), w.get("reason"), w.get("timestamp"), int(bool(w.get("auto"))))
+                            for w in warnings
+                        ]
+                    )
+            
+            for table in ("bans", "mutes"):
+                for guild_id, users in ban_mute_data.get(table, {}).items():
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO {table} (guild_id, user_id, moderator_id, reason, duration, expiry, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (int(guild_id), int(user_id), r.get("moderator_id"), r.get("reason"), r.get("duration"), r.get("expiry"), r.get("timestamp"))
+                            for user_id, r in users.items()
+                        ]
+                    )
+            
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.utcnow().isoformat(),)
+            )
+        return True
+    
+    @staticmethod
+    def _get_warnings(conn: sqlite3.Connection, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            "SELECT reason, moderator_id, timestamp, auto FROM warnings WHERE guild_id = ? AND user_id = ? ORDER BY id",
+            (guild_id, user_id)
+        ).fetchall()
+        return [
+            {"reason": r["reason"], "moderator_id": r["moderator_id"], "timestamp": r["timestamp"], "auto": bool(r["auto"])}
+            for r in rows
+        ]
+    
+    async def get_warnings(self, guild_id: int, user_id: int) -> List[Dict[str, Any]]:
+        return await self._run(self._get_warnings, guild_id, user_id)
+    
+    @staticmethod
+    def _add_warning(conn: sqlite3.Connection, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, auto: bool) -> int:
+        with conn:
+            conn.execute(
+                "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, timestamp, auto) VALUES (?, ?, ?, ?, ?, ?)",
+                (guild_id, user_id, moderator_id, reason, datetime.utcnow().isoformat(), int(auto))
+            )
+        return conn.execute(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id)
+        ).fetchone()[0]
+    
+    async def add_warning(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, auto: bool = False) -> int:
+        return await self._run(self._add_warning, guild_id, user_id, moderator_id, reason, auto)
+    
+    @staticmethod
+    def _pop_warning(conn: sqlite3.Connection, guild_id: int, user_id: int) -> Optional[int]:
+        with conn:
+            row = conn.execute(
+                "SELECT MAX(id) FROM warnings WHERE guild_id = ? AND user_id = ?",
+                (guild_id, user_id)
+            ).fetchone()
+            if row[0] is None:
+                return None
+            conn.execute("DELETE FROM warnings WHERE id = ?", (row[0],))
+        return conn.execute(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id)
+        ).fetchone()[0]
+    
+    async def pop_warning(self, guild_id: int, user_id: int) -> Optional[int]:
+        return await self._run(self._pop_warning, guild_id, user_id)
+    
+    @staticmethod
+    def _count_guild_warnings(conn: sqlite3.Connection, guild_id: int) -> int:
+        return conn.execute("SELECT COUNT(*) FROM warnings WHERE guild_id = ?", (guild_id,)).fetchone()[0]
+    
+    async def count_guild_warnings(self, guild_id: int) -> int:
+        return await self._run(self._count_guild_warnings, guild_id)
+    
+    @staticmethod
+    def _set_record(conn: sqlite3.Connection, table: str, guild_id: int, user_id: int, record: Dict[str, Any]) -> None:
+        with conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} (guild_id, user_id, moderator_id, reason, duration, expiry, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, user_id, record["moderator_id"], record["reason"], record["duration"], record["expiry"], record["timestamp"])
+            )
+    
+    @staticmethod
+    def _remove_record(conn: sqlite3.Connection, table: str, guild_id: int, user_id: int) -> None:
+        with conn:
+            conn.execute(f"DELETE FROM {table} WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+    
+    async def record_ban(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        await self._run(self._set_record, "bans", guild_id, user_id, _punishment_record(moderator_id, reason, duration, expiry))
+    
+    async def remove_ban(self, guild_id: int, user_id: int) -> None:
+        await self._run(self._remove_record, "bans", guild_id, user_id)
+    
+    async def record_mute(self, guild_id: int, user_id: int, moderator_id: ModeratorId, reason: str, duration: Optional[str], expiry: Optional[datetime]) -> None:
+        await self._run(self._set_record, "mutes", guild_id, user_id, _punishment_record(moderator_id, reason, duration, expiry))
+    
+    async def remove_mute(self, guild_id: int, user_id: int) -> None:
+        await self._run(self._remove_record, "mutes", guild_id, user_id)
+    
+    @staticmethod
+    def _pending_expiries(conn: sqlite3.Connection) -> List[PendingExpiry]:
+        rows = conn.execute(
+            "SELECT 'ban' AS action, guild_id, user_id, expiry FROM bans WHERE expiry IS NOT NULL "
+            "UNION ALL "
+            "SELECT 'mute' AS action, guild_id, user_id, expiry FROM mutes WHERE expiry IS NOT NULL"
+        ).fetchall()
+        pending = []
+        for r in rows:
+            expiry = _parse_expiry(r["expiry"])
+            if expiry is not None:
+                pending.append((r["action"], r["guild_id"], r["user_id"], expiry))
+        return pending
+    
+    async def pending_expiries(self) -> List[PendingExpiry]:
+        return await self._run(self._pending_expiries)
+    
+    async def close(self) -> None:
+        async with self._lock:
+            if self._conn is not None:
+                await asyncio.to_thread(self._conn.close)
+                self._conn = None
+
+_store: ModerationStore = JSONModerationStore()
+
+async def configure_store(backend: str = "json") -> ModerationStore:
+    global _store
+    await _store.close()
+    
+    if backend == "sqlite":
+        store = SQLiteModerationStore()
+    elif backend == "journal":
+        store = JournaledModerationStore()
+    else:
+        store = JSONModerationStore()
+    
+    await store.open()
+    _store = store
+    return _store
+
+def get_store() -> ModerationStore:
+    return _store
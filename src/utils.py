@@ -3,10 +3,15 @@ import asyncio
 import aiofiles
 import discord
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union, Tuple, Set, AsyncIterator
+from collections import defaultdict
+from contextlib import asynccontextmanager
+import copy
 import re
 import os
 
+from src.purge import PurgeProgress, purge_messages, purge_user_messages
+
 DATA_DIR = "data"
 
 DURATION_REGEX = re.compile(r'^(\d+)(s|m|h|d|w|mo)$')
@@ -63,6 +68,20 @@ def get_expiry_time(duration_str: Optional[str]) -> Optional[datetime]:
 
 class JSONStorage:
     _locks: Dict[str, asyncio.Lock] = {}
+    _cache: Dict[str, Any] = {}
+    _stamps: Dict[str, Tuple[int, int]] = {}
+    _hits: Dict[str, int] = defaultdict(int)
+    _misses: Dict[str, int] = defaultdict(int)
+    _generations: Dict[str, int] = defaultdict(int)
+    _write_behind: bool = False
+    _flush_interval: float = 2.0
+    _dirty: Set[str] = set()
+    _flush_task: Optional[asyncio.Task] = None
+    
+    @classmethod
+    def configure(cls, write_behind: bool = False, flush_interval: float = 2.0) -> None:
+        cls._write_behind = write_behind
+        cls._flush_interval = flush_interval
     
     @classmethod
     def _get_lock(cls, filename: str) -> asyncio.Lock:
@@ -70,35 +89,156 @@ class JSONStorage:
             cls._locks[filename] = asyncio.Lock()
         return cls._locks[filename]
     
+    @staticmethod
+    def _stat(filepath: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    @staticmethod
+    def _write_atomic(filepath: str, content: str) -> None:
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    
     @classmethod
-    async def load(cls, filename: str) -> Dict[str, Any]:
+    async def _write(cls, filename: str, data: Dict[str, Any]) -> None:
         filepath = os.path.join(DATA_DIR, filename)
-        lock = cls._get_lock(filename)
-        
-        async with lock:
-            try:
-                async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    return json.loads(content)
-            except FileNotFoundError:
-                return {}
-            except json.JSONDecodeError:
-                return {}
+        content = json.dumps(data, indent=2, ensure_ascii=False)
+        await asyncio.to_thread(cls._write_atomic, filepath, content)
+        cls._stamps[filename] = cls._stat(filepath)
     
     @classmethod
-    async def save(cls, filename: str, data: Dict[str, Any]) -> None:
+    async def _refresh_unlocked(cls, filename: str) -> Optional[Dict[str, Any]]:
         filepath = os.path.join(DATA_DIR, filename)
-        lock = cls._get_lock(filename)
         
-        async with lock:
-            async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        if filename in cls._dirty:
+            cls._hits[filename] += 1
+            return cls._cache[filename]
+        
+        stamp = cls._stat(filepath)
+        if stamp is not None and filename in cls._cache and cls._stamps.get(filename) == stamp:
+            cls._hits[filename] += 1
+            return cls._cache[filename]
+        
+        cls._misses[filename] += 1
+        try:
+            async with aiofiles.open(filepath, 'r', encoding='utf-8') as f:
+                content = await f.read()
+                data = json.loads(content)
+        except (FileNotFoundError, json.JSONDecodeError):
+            if filename in cls._cache:
+                cls._set_cached(filename, None, None)
+            return None
+        
+        cls._set_cached(filename, data, stamp)
+        return data
+    
+    @classmethod
+    def _set_cached(cls, filename: str, data: Optional[Dict[str, Any]], stamp: Optional[Tuple[int, int]]) -> None:
+        if data is None:
+            cls._cache.pop(filename, None)
+            cls._stamps.pop(filename, None)
+        else:
+            cls._cache[filename] = data
+            cls._stamps[filename] = stamp
+        cls._generations[filename] += 1
+    
+    @classmethod
+    async def _load_unlocked(cls, filename: str) -> Dict[str, Any]:
+        data = await cls._refresh_unlocked(filename)
+        return copy.deepcopy(data) if data is not None else {}
+    
+    @classmethod
+    async def _save_unlocked(cls, filename: str, data: Dict[str, Any], owned: bool = False) -> None:
+        cls._set_cached(filename, data if owned else copy.deepcopy(data), cls._stamps.get(filename))
+        
+        if cls._write_behind:
+            cls._dirty.add(filename)
+            cls._schedule_flush()
+        else:
+            await cls._write(filename, data)
+    
+    @classmethod
+    async def load(cls, filename: str) -> Dict[str, Any]:
+        async with cls._get_lock(filename):
+            data = await cls._refresh_unlocked(filename)
+            return data if data is not None else {}
+    
+    @classmethod
+    async def load_copy(cls, filename: str) -> Dict[str, Any]:
+        async with cls._get_lock(filename):
+            return await cls._load_unlocked(filename)
+    
+    @classmethod
+    async def save(cls, filename: str, data: Dict[str, Any]) -> None:
+        async with cls._get_lock(filename):
+            await cls._save_unlocked(filename, data)
+    
+    @classmethod
+    async def generation(cls, filename: str) -> int:
+        async with cls._get_lock(filename):
+            await cls._refresh_unlocked(filename)
+            return cls._generations[filename]
+    
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls, filename: str) -> AsyncIterator[Dict[str, Any]]:
+        async with cls._get_lock(filename):
+            data = await cls._load_unlocked(filename)
+            yield data
+            if filename not in cls._cache or data != cls._cache[filename]:
+                await cls._save_unlocked(filename, data, owned=True)
+    
+    @classmethod
+    def _schedule_flush(cls) -> None:
+        if cls._flush_task is None or cls._flush_task.done():
+            cls._flush_task = asyncio.create_task(cls._delayed_flush())
+    
+    @classmethod
+    async def _delayed_flush(cls) -> None:
+        while cls._dirty:
+            await asyncio.sleep(cls._flush_interval)
+            try:
+                await cls.flush()
+            except OSError as e:
+                print(f"Lỗi khi ghi dữ liệu JSON: {e}")
+    
+    @classmethod
+    async def flush(cls) -> None:
+        for filename in list(cls._dirty):
+            async with cls._get_lock(filename):
+                if filename not in cls._dirty:
+                    continue
+                cls._dirty.discard(filename)
+                try:
+                    await cls._write(filename, cls._cache[filename])
+                except OSError:
+                    cls._dirty.add(filename)
+                    raise
     
     @classmethod
     async def update(cls, filename: str, key: str, value: Any) -> None:
-        data = await cls.load(filename)
-        data[key] = value
-        await cls.save(filename, data)
+        async with cls.transaction(filename) as data:
+            data[key] = value
+    
+    @classmethod
+    def invalidate(cls, filename: Optional[str] = None) -> None:
+        names = list(cls._cache) if filename is None else [filename]
+        for name in names:
+            if name not in cls._dirty:
+                cls._set_cached(name, None, None)
+    
+    @classmethod
+    def cache_stats(cls, filename: Optional[str] = None) -> Dict[str, int]:
+        if filename is not None:
+            return {"hits": cls._hits[filename], "misses": cls._misses[filename]}
+        return {"hits": sum(cls._hits.values()), "misses": sum(cls._misses.values())}
 
 class EmbedBuilder:
     COLORS = {
@@ -264,6 +404,49 @@ class EmbedBuilder:
         
         return embed
     
+    @classmethod
+    def raid_detection(
+        cls,
+        users: List[discord.Member],
+        fingerprint: str,
+        action: str
+    ) -> discord.Embed:
+        embed = discord.Embed(
+            title="🚨 Phát Hiện Raid",
+            color=cls.COLORS['spam'],
+            timestamp=datetime.utcnow()
+        )
+        
+        embed.add_field(
+            name="👥 Số tài khoản",
+            value=str(len(users)),
+            inline=True
+        )
+        
+        embed.add_field(
+            name="⚡ Hành động",
+            value=action,
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🔍 Nội dung chung",
+            value=f"||{fingerprint[:200]}||",
+            inline=False
+        )
+        
+        mentions = " ".join(user.mention for user in users[:40])
+        if len(users) > 40:
+            mentions += f" (+{len(users) - 40})"
+        
+        embed.add_field(
+            name="👤 Người dùng",
+            value=mentions or "Không rõ",
+            inline=False
+        )
+        
+        return embed
+    
     @classmethod
     def scam_detection(
         cls,
@@ -344,27 +527,21 @@ class EmbedBuilder:
             color=cls.COLORS['success']
         )
 
-async def delete_messages_safely(channel: discord.TextChannel, messages: list, delay: float = 0.5):
+async def delete_messages_safely(messages: List[discord.Message]) -> PurgeProgress:
+    by_channel: Dict[int, List[discord.Message]] = defaultdict(list)
     for msg in messages:
-        try:
-            await msg.delete()
-            await asyncio.sleep(delay)
-        except discord.NotFound:
-            pass
-        except discord.Forbidden:
-            pass
-        except discord.HTTPException:
-            await asyncio.sleep(2)
+        by_channel[msg.channel.id].append(msg)
+    
+    progress = PurgeProgress(len(by_channel))
+    await asyncio.gather(*(
+        purge_messages(channel_messages[0].channel, channel_messages, progress)
+        for channel_messages in by_channel.values()
+    ))
+    progress.channels_done = len(by_channel)
+    return progress
 
-async def delete_user_messages(guild: discord.Guild, user_id: int, delay: float = 1.0):
-    for channel in guild.text_channels:
-        try:
-            async for message in channel.history(limit=100):
-                if message.author.id == user_id:
-                    try:
-                        await message.delete()
-                        await asyncio.sleep(delay)
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                        continue
-        except discord.Forbidden:
-            continue
+async def delete_user_messages(guild: discord.Guild, user_id: int, limit: int = 100):
+    progress = await purge_user_messages(guild, user_id, limit=limit)
+    if progress.deleted or progress.failed:
+        print(f"Dọn tin nhắn của {user_id} tại {guild.name}: {progress.summary()}")
+    return progress
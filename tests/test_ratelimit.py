@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.antispam import SpamTracker
+from src.profiles import DEFAULT_SETTINGS
+
+def window_trip(messages: int, interval: float, spacing: float, count: int):
+    times = [i * spacing for i in range(count)]
+    for index, now in enumerate(times):
+        if sum(1 for ts in times[:index + 1] if now - ts <= interval) >= messages:
+            return index + 1
+    return None
+
+def bucket_trip(messages: int, interval: float, spacing: float, count: int):
+    tracker = SpamTracker()
+    for index in range(count):
+        if not tracker.consume(("spam", 1, 1), messages, interval, 1000.0 + index * spacing):
+            return index + 1
+    return None
+
+def test_spam_threshold_trips_like_the_window():
+    messages, interval = DEFAULT_SETTINGS.spam_threshold, DEFAULT_SETTINGS.spam_interval
+    for spacing in (0.1, 0.5, 1.0, 1.2):
+        expected = window_trip(messages, interval, spacing, 100)
+        assert expected == messages
+        assert bucket_trip(messages, interval, spacing, 100) == expected, spacing
+
+def test_rate_limit_trips_like_the_window():
+    messages, interval = DEFAULT_SETTINGS.rate_limit_messages, DEFAULT_SETTINGS.rate_limit_interval
+    for spacing in (0.1, 0.3, 0.5):
+        expected = window_trip(messages, interval, spacing, 100)
+        assert expected == messages
+        assert bucket_trip(messages, interval, spacing, 100) == expected, spacing
+
+def test_slow_messages_do_not_trip():
+    messages, interval = DEFAULT_SETTINGS.spam_threshold, DEFAULT_SETTINGS.spam_interval
+    assert bucket_trip(messages, interval, interval + 0.1, 100) is None
+
+def test_disabled_limit_never_trips():
+    assert bucket_trip(0, 5, 0.01, 100) is None
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.matcher import simhash, hamming_distance, duplicate_distance, SIMHASH_MAX_LENGTH
+from src.profiles import DEFAULT_SETTINGS
+
+BASE_DISTANCE = DEFAULT_SETTINGS.duplicate_distance
+
+NEAR_DUPLICATES = [
+    ("Mua nitro giá rẻ tại đây nhé mọi người", "Mua nitro giá rẻ tại đây nhé mọi người!!"),
+    ("free nitro click here", "free nitro click herre"),
+    ("ai muốn nhận quà thì inbox mình nha", "ai muốn nhận quà thì inbox mình nha 1"),
+    ("join server của mình để nhận role vip miễn phí", "JOIN server của mình để nhận role VIP miễn phí"),
+]
+
+UNRELATED = [
+    ("hôm nay trời đẹp quá", "tối nay ai chơi game không"),
+    ("free nitro click here", "mình vừa ăn phở xong"),
+    ("cho mình hỏi cách cài bot với", "bài hát này hay thật sự luôn đó"),
+    ("lol", "gg"),
+]
+
+def is_duplicate(left: str, right: str) -> bool:
+    return hamming_distance(simhash(left), simhash(right)) <= duplicate_distance(len(right), BASE_DISTANCE)
+
+def reference_simhash(text: str) -> int:
+    text = " ".join(text[:SIMHASH_MAX_LENGTH].lower().split())
+    features = {text[i:i + 3] for i in range(len(text) - 2)} if len(text) > 3 else {text}
+    counts = [0] * 64
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+        for bit in range(64):
+            counts[bit] += (value >> bit) & 1
+    return sum(1 << bit for bit, count in enumerate(counts) if count > len(features) // 2)
+
+def test_simhash_matches_per_bit_counting():
+    for left, right in NEAR_DUPLICATES + UNRELATED:
+        for text in (left, right, left * 20):
+            assert simhash(text) == reference_simhash(text), text
+
+def test_simhash_is_stable_across_processes():
+    code = "from src.matcher import simhash; print(simhash('free nitro click here'))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    values = {
+        subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+        for seed in ("1", "2", "3")
+    }
+    assert values == {str(simhash("free nitro click here"))}
+
+def test_near_duplicates_are_flagged():
+    for left, right in NEAR_DUPLICATES:
+        assert is_duplicate(left, right), (left, right)
+
+def test_unrelated_texts_are_not_flagged():
+    for left, right in UNRELATED:
+        assert not is_duplicate(left, right), (left, right)
+
+def test_identical_texts_have_zero_distance():
+    assert hamming_distance(simhash("spam spam spam"), simhash("  SPAM spam   spam ")) == 0
+
+def test_short_texts_get_a_wider_distance():
+    assert duplicate_distance(10, BASE_DISTANCE) > duplicate_distance(200, BASE_DISTANCE) == BASE_DISTANCE